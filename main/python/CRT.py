@@ -1,12 +1,4 @@
-def gcd(a, m):
-    if m == 0:
-        return a, 1, 0
-
-    gcd_val, p_prime, q_prime = gcd(m, a % m)
-    p = q_prime
-    q = p_prime - (a // m) * q_prime
-
-    return gcd_val, p, q
+from xgcd import xgcd as gcd, parse_int, int_text
 
 def linear_congruence_solver(a, b, m):
     d, p, q = gcd(a, m)
@@ -17,34 +9,225 @@ def linear_congruence_solver(a, b, m):
     x0 = (b * p // d) % m
     return x0
 
+def find_conflicting_pair(congruences, j):
+    a_j, m_j = congruences[j]
+    from math import gcd as _gcd
+    for i in range(j):
+        a_i, m_i = congruences[i]
+        if (a_i - a_j) % _gcd(m_i, m_j) != 0:
+            return i, j
+    return None
+
+def _combine(r1, L1, r2, L2):
+    # x ≡ r1 (mod L1) and x ≡ r2 (mod L2) as one x ≡ r (mod lcm(L1, L2)).
+    # Returns (r, lcm, gcd(L1, L2)), or None when the two cannot both hold.
+    from math import gcd as _gcd
+    t = linear_congruence_solver(L1 % L2, (r2 - r1) % L2, L2)
+    if t is None:
+        return None
+    g = _gcd(L1, L2)
+    L = L1 // g * L2
+    return (r1 + L1 * t) % L, L, g
+
+def _merge_levels(congruences):
+    # Combines adjacent (r, L) pairs level by level, as the product tree does,
+    # so every operand stays balanced and the total cost is quasi-linear
+    # rather than the quadratic of a left fold.  Returns (r, L, coprime), or
+    # None when the system is inconsistent.
+    level = [(a % abs(m), abs(m)) for a, m in congruences]
+    coprime = True
+    while len(level) > 1:
+        merged = []
+        for i in range(0, len(level) - 1, 2):
+            combined = _combine(*level[i], *level[i + 1])
+            if combined is None:
+                return None
+            r, L, g = combined
+            coprime = coprime and g == 1
+            merged.append((r, L))
+        if len(level) % 2:
+            merged.append(level[-1])
+        level = merged
+    r, L = level[0]
+    return r, L, coprime
+
+def merge_congruences(congruences):
+    # Merges x ≡ a_i (mod m_i) into one x ≡ r (mod L).  Returns
+    # (r, L, coprime, None), or (None, None, False, (i, j)) for the first pair
+    # of congruences that cannot hold together.
+    merged = _merge_levels(congruences)
+    if merged is not None:
+        return (*merged, None)
+    # Binary search for the shortest inconsistent prefix; its last congruence
+    # conflicts with an earlier one.
+    lo, hi = 1, len(congruences)
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if _merge_levels(congruences[:mid]) is None:
+            hi = mid
+        else:
+            lo = mid
+    return None, None, False, find_conflicting_pair(congruences, hi - 1)
+
+def fold_steps(congruences):
+    # The running x ≡ r (mod L) after each congruence, folding left; only
+    # used to list a bounded prefix.
+    r, L = 0, 1
+    steps = []
+    for a, m in congruences:
+        r, L, _ = _combine(r, L, a % abs(m), abs(m))
+        steps.append((r, L))
+    return steps
+
+MAX_LISTED_STEPS = 100
+
+def merged_solution_text(congruences, r, L):
+    # Lists the intermediate (r, L) of the first MAX_LISTED_STEPS merges only,
+    # re-running the merge on that prefix rather than keeping every step.
+    steps = fold_steps(congruences[:MAX_LISTED_STEPS])
+    output = "\n⚠️ Moduli are not pairwise co-prime. Merging congruences one at a time:\n"
+    output += f"x ≡ {int_text(steps[0][0])} mod {int_text(steps[0][1])}\n"
+    for i in range(1, len(steps)):
+        a_i, m_i = congruences[i]
+        output += f"+ x ≡ {int_text(a_i)} mod {int_text(m_i)}  =>  x ≡ {int_text(steps[i][0])} mod {int_text(steps[i][1])}\n"
+    if len(congruences) > len(steps):
+        output += f"... {len(congruences) - len(steps)} more congruences merged\n"
+    output += f"\nFinal solution: x ≡ {int_text(r)} mod {int_text(L)}\n"
+    return output + f"\nThe smallest positive solution is: {int_text(r)}\n"
+
+TREE_THRESHOLD = 64
+FAST_MOD_BITS = 40000
+
+def _reciprocal(m, e):
+    # Approximates 2**e // m by Newton iteration, doubling the precision at
+    # each level, so the cost is a few multiplications instead of one long
+    # schoolbook division.
+    k = m.bit_length()
+    p = e - k
+    if p <= FAST_MOD_BITS or k <= FAST_MOD_BITS:
+        return (1 << e) // m
+    half = p // 2 + 32
+    t = max(0, k - half - 32)
+    mt = m >> t
+    x = _reciprocal(mt, half + mt.bit_length()) << (p - half)
+    x = x + ((x * ((1 << e) - m * x)) >> e)
+    return x
+
+def _mod(a, m):
+    # a % m, switching to a Barrett reduction against a Newton reciprocal once
+    # the operands are large enough for schoolbook division to dominate.
+    if m.bit_length() <= FAST_MOD_BITS or a.bit_length() - m.bit_length() <= FAST_MOD_BITS:
+        return a % m
+    e = a.bit_length()
+    q = (a * _reciprocal(m, e)) >> e
+    r = a - q * m
+    while r < 0:
+        r += m
+    while r >= m:
+        r -= m
+    return r
+
+def product_tree(values):
+    # Level 0 holds the values, each level above holds products of adjacent
+    # pairs, and the last level holds the single full product.
+    tree = [list(values)]
+    while len(tree[-1]) > 1:
+        level = tree[-1]
+        tree.append([level[i] * level[i + 1] if i + 1 < len(level) else level[i]
+                     for i in range(0, len(level), 2)])
+    return tree
+
+def batch_cofactors(m_list, tree=None):
+    # For M = m1 * ... * mn returns (M/m_i) mod m_i for every i without the
+    # n full-size divisions M // m_i.  Walking down the product tree, a child
+    # inherits its parent's cofactor reduced mod the child and multiplied by
+    # its sibling.  gcd(m_i, result_i) is then Bernstein's batch gcd of m_i
+    # against the product of all other moduli.
+    if tree is None:
+        tree = product_tree(m_list)
+    cofactors = [1 % tree[-1][0]]
+    for level in reversed(tree[:-1]):
+        next_cofactors = []
+        for i, node in enumerate(level):
+            parent = cofactors[i // 2]
+            if i ^ 1 < len(level):
+                next_cofactors.append(_mod(_mod(parent, node) * _mod(level[i ^ 1], node), node))
+            else:
+                next_cofactors.append(parent)
+        cofactors = next_cofactors
+    return cofactors
+
+def pairwise_coprime(m_list, tree=None):
+    from math import gcd as _gcd
+    cofactors = batch_cofactors(m_list, tree)
+    return all(_gcd(m, c) == 1 for m, c in zip(m_list, cofactors))
+
+def crt_tree_solver(congruences):
+    # Subquadratic CRT for pairwise coprime moduli, built on a product tree.
+    # Returns (x, M), or None when the moduli are not pairwise coprime.
+    a_list = [a for a, m in congruences]
+    m_list = [abs(m) for a, m in congruences]
+    tree = product_tree(m_list)
+    cofactors = batch_cofactors(m_list, tree)
+    terms = []
+    for a, m, c in zip(a_list, m_list, cofactors):
+        if m == 1:
+            terms.append(0)
+            continue
+        b = linear_congruence_solver(c, 1, m)
+        if b is None:
+            return None
+        terms.append(a * b % m)
+
+    # Combine bottom up: a node with children (v1, P1), (v2, P2) holds
+    # v1 * P2 + v2 * P1, so the root holds sum(a_i * b_i * M_i).
+    for level in tree[:-1]:
+        terms = [terms[i] * level[i + 1] + terms[i + 1] * level[i] if i + 1 < len(level) else terms[i]
+                 for i in range(0, len(level), 2)]
+    M = tree[-1][0]
+    return _mod(terms[0], M), M
+
 def crt_solver(congruences):
     output = ""
     n = len(congruences)
+    if n >= TREE_THRESHOLD:
+        solved = crt_tree_solver(congruences)
+        if solved is not None:
+            x, M = solved
+            output += f"\nSolved {n} pairwise co-prime congruences with a product tree.\n"
+            output += f"\nFinal solution: x ≡ {int_text(x)} mod {int_text(M)}\n"
+            return output + f"\nThe smallest positive solution is: {int_text(x)}\n"
+
+    r, L, coprime, conflict = merge_congruences(congruences)
+    if conflict is not None:
+        i, j = conflict
+        (a_i, m_i), (a_j, m_j) = congruences[i], congruences[j]
+        a_i, m_i, a_j, m_j = map(int_text, (a_i, m_i, a_j, m_j))
+        return (f"\n❌ No solution: x ≡ {a_i} (mod {m_i}) and x ≡ {a_j} (mod {m_j}) "
+                f"are inconsistent, since {a_i} ≢ {a_j} mod gcd({m_i}, {m_j}).\n")
+    if not coprime:
+        return output + merged_solution_text(congruences, r, L)
+
     a_list = [a for a, m in congruences]
     m_list = [m for a, m in congruences]
-    from math import gcd
-    from itertools import combinations
-    for (m1,m2) in combinations(m_list,2):
-        if gcd(m1,m2)!=1:
-            return "❌ Moduli are not pairwise co-prime. CRT may not be applicable"
     M = 1
     for m in m_list:
         M *= m
-    output += f"\nM = m1 * m2 * ... * mn = {M}\n"
+    output += f"\nM = m1 * m2 * ... * mn = {int_text(M)}\n"
 
     M_list = [M // m_i for m_i in m_list]
 
     output += "\nSolving the required congruences:\n"
     for i in range(n):
-        output += f"(M/m{i+1})*x ≡ 1 mod m{i+1}: {M_list[i]}*x ≡ 1 mod {m_list[i]}\n"
+        output += f"(M/m{i+1})*x ≡ 1 mod m{i+1}: {int_text(M_list[i])}*x ≡ 1 mod {int_text(m_list[i])}\n"
 
     solutions = []
     for i in range(n):
         b_i = linear_congruence_solver(M_list[i], 1, m_list[i])
         if b_i is None:
-            output += f"No solution exists for {M_list[i]}*x ≡ 1 mod {m_list[i]}\n"
+            output += f"No solution exists for {int_text(M_list[i])}*x ≡ 1 mod {int_text(m_list[i])}\n"
             return output
-        output += f"Solution: x ≡ {b_i} mod {m_list[i]}\n"
+        output += f"Solution: x ≡ {int_text(b_i)} mod {int_text(m_list[i])}\n"
         solutions.append(b_i)
 
     x0 = 0
@@ -59,10 +242,10 @@ def crt_solver(congruences):
     expression = " + ".join(terms)
     output += f"x0 = {expression}\n"
 
-    output += f"x0 = {x0}\n"
-    output += f"\nx ≡ {x0} mod {M}\n"
-    output += f"\nFinal solution: x ≡ {x} mod {M}\n"
-    return output + f"\nThe smallest positive solution is: {x}\n"
+    output += f"x0 = {int_text(x0)}\n"
+    output += f"\nx ≡ {int_text(x0)} mod {int_text(M)}\n"
+    output += f"\nFinal solution: x ≡ {int_text(x)} mod {int_text(M)}\n"
+    return output + f"\nThe smallest positive solution is: {int_text(x)}\n"
 
 def main(arg=None):
     output = ""
@@ -78,14 +261,14 @@ def main(arg=None):
 
         congruences = []
         for i in range(0, len(parts), 2):
-            a = int(parts[i])
-            m = int(parts[i+1])
+            a = parse_int(parts[i])
+            m = parse_int(parts[i+1])
             if m == 0:
                 return "❌ Modulus 'm' cannot be zero."
             congruences.append((a, m))
 
         for i,(a,m) in enumerate(congruences):
-            output+=f"x ≡ {a} (mod {m})\n"
+            output+=f"x ≡ {int_text(a)} (mod {int_text(m)})\n"
 
         result=crt_solver(congruences)
         output+= result if result else "\nNo solution found.\n"
@@ -1,8 +1,10 @@
-from sympy import symbols, Poly, div, lcm, LC, simplify, S, sympify
+from sympy import symbols, Poly, div, lcm, LC, simplify, S, sympify, ZZ, QQ
+import math
 import re
-import sys
+from fractions import Fraction
 from io import StringIO
-import re
+from sparse_poly import sparse_division_chain
+from gf_poly import split_modulus, gf_from_rationals, gf_divmod
 
 def convert_unicode_superscripts(expr: str) -> str:
     """
@@ -76,7 +78,308 @@ def scale_to_match_leading_coeff(f1, f2):
         return S.Zero
     return S(lcm(lc2, lc1)) // lc1
 
+# Divisors with leading coefficient ±1 up to this degree take synthetic
+# division in batch_divide.
+SYNTHETIC_MAX_DEGREE = 8
+
+def _strip(coeffs):
+    # Drops leading zero coefficients, keeping [0] for the zero polynomial.
+    i = 0
+    while i < len(coeffs) - 1 and coeffs[i] == 0:
+        i += 1
+    return coeffs[i:]
+
+def _content(coeffs):
+    g = 0
+    for c in coeffs:
+        g = math.gcd(g, c)
+    return g
+
+def pseudo_divide(dividend, divisor):
+    """
+    Fraction-free division of integer coefficient lists (highest degree
+    first).  Returns (d, q, r) with d·dividend = q·divisor + r, deg r <
+    deg divisor and d > 0.  d only picks up the factor of the divisor's
+    leading coefficient that a leading term actually lacks, and the common
+    content of d, q and r is removed at the end.
+    """
+    lc = divisor[0]
+    m, n = len(divisor), len(dividend)
+    if n < m:
+        return 1, [0], list(dividend)
+    r = list(dividend)
+    q = [0] * (n - m + 1)
+    d = 1
+    for i in range(n - m + 1):
+        c = r[i]
+        if c == 0:
+            continue
+        if c % lc:
+            g = abs(lc) // math.gcd(c, lc)
+            d *= g
+            for j in range(i):
+                q[j] *= g
+            for j in range(i, n):
+                r[j] *= g
+            c = r[i]
+        t = c // lc
+        q[i] = t
+        for j in range(1, m):
+            r[i + j] -= t * divisor[j]
+        r[i] = 0
+    r = _strip(r[n - m + 1:]) if m > 1 else [0]
+    g = math.gcd(d, _content(q), _content(r))
+    if g > 1:
+        d //= g
+        q = [c // g for c in q]
+        r = [c // g for c in r]
+    return d, q, r
+
+def synthetic_divide(dividend, divisor):
+    """
+    Exact division by an integer divisor with leading coefficient ±1
+    (highest degree first).  Returns (q, r) as integer lists.  A linear
+    divisor ±(x - root) is Horner's rule; higher degrees use expanded
+    synthetic division, adding multiples of the negated divisor tail.
+    """
+    lc = divisor[0]
+    m, n = len(divisor) - 1, len(dividend)
+    if n <= m:
+        return [0], _strip(list(dividend))
+    if m == 0:
+        return [c * lc for c in dividend], [0]
+    if m == 1:
+        root = -divisor[1] * lc
+        acc, out = 0, []
+        for c in dividend:
+            acc = acc * root + c
+            out.append(acc)
+        remainder = out.pop()
+        return [c * lc for c in out], [remainder]
+    tail = [-c * lc for c in divisor[1:]]
+    out = list(dividend)
+    for i in range(n - m):
+        c = out[i]
+        if c:
+            for j, t in enumerate(tail, 1):
+                out[i + j] += c * t
+    return [c * lc for c in out[:n - m]], _strip(out[n - m:])
+
+def _pack(coeffs, width):
+    # Kronecker substitution: the value of the polynomial at 256**width,
+    # assembled from two's-complement blocks and then corrected for the
+    # borrow each negative coefficient leaves in the next block.
+    data = b"".join(c.to_bytes(width, "little", signed=True) for c in coeffs)
+    borrows = b"".join(b"\x01" + bytes(width - 1) if c < 0 else bytes(width) for c in coeffs)
+    return int.from_bytes(data, "little") - (int.from_bytes(borrows, "little") << (8 * width))
+
+def _unpack(value, width, count):
+    # Inverse of _pack for coefficients below 2**(8·width - 1) in size:
+    # offsetting every block by half its range makes all of them positive.
+    offset = int.from_bytes((bytes(width - 1) + b"\x80") * count, "little")
+    data = (value + offset).to_bytes(width * count, "little")
+    half = 1 << (8 * width - 1)
+    return [int.from_bytes(data[i:i + width], "little") - half for i in range(0, width * count, width)]
+
+def poly_multiply(a, b):
+    """
+    Product of integer coefficient lists by one big-integer multiplication
+    (Kronecker substitution), so CPython's Karatsuba does the work.  Works
+    for either coefficient order, as long as both lists use the same one.
+    """
+    if not a or not b:
+        return []
+    bound = max(map(abs, a)) * max(map(abs, b)) * min(len(a), len(b))
+    if bound == 0:
+        return [0] * (len(a) + len(b) - 1)
+    width = (bound.bit_length() + 9) // 8
+    return _unpack(_pack(a, width) * _pack(b, width), width, len(a) + len(b) - 1)
+
+def _reduce(d, q, r):
+    # Normalizes d·a = q·b + r to d > 0 with no content common to d, q, r.
+    if d < 0:
+        d, q, r = -d, [-v for v in q], [-v for v in r]
+    g = math.gcd(d, _content(q), _content(r))
+    if g > 1:
+        d, q, r = d // g, [v // g for v in q], [v // g for v in r]
+    return d, q, r
+
+class FixedDivisor:
+    """
+    Divides many dividends by one integer divisor.  The reversed divisor's
+    power-series inverse is computed once by Newton iteration (and extended
+    when a longer dividend arrives); each division is then two
+    poly_multiply calls.  For a leading coefficient c ≠ ±1 the inverse is
+    taken of rev(b)(c·t)/c, which has integer coefficients, and powers of c
+    end up in the denominator d.
+    """
+
+    def __init__(self, divisor):
+        self.divisor = _strip(list(divisor))
+        if not any(self.divisor):
+            raise ZeroDivisionError("polynomial division by zero")
+        self.lc = self.divisor[0]
+        self.degree = len(self.divisor) - 1
+        c = self.lc
+        # Low-degree-first coefficients of rev(b)(c·t)/c.
+        self._series = [1] + [b * c ** (i - 1) for i, b in enumerate(self.divisor[1:], 1)]
+        self._inverse = [1]
+
+    def _inverse_to(self, length):
+        g = self._inverse
+        while len(g) < length:
+            prec = min(2 * len(g), length)
+            e = poly_multiply(self._series[:prec], g)[:prec]
+            e = [-v for v in e] + [0] * (prec - len(e))
+            e[0] += 2
+            g = poly_multiply(g, e)[:prec]
+        self._inverse = g
+        return g[:length]
+
+    def divide(self, dividend):
+        """Returns (d, q, r) with d·dividend = q·divisor + r, as pseudo_divide does."""
+        dividend = _strip(list(dividend))
+        n, m, c = len(dividend) - 1, self.degree, self.lc
+        if n < m:
+            return 1, [0], dividend
+        k = n - m + 1
+        powers = [1]
+        for _ in range(k):
+            powers.append(powers[-1] * c)
+        scaled = [a * powers[j] for j, a in enumerate(dividend[:k])]
+        p = poly_multiply(scaled, self._inverse_to(k))[:k]
+        # Quotient coefficient i is p[i] / c^(i+1); bring all to c^k.
+        q = [v * powers[k - 1 - i] for i, v in enumerate(p)]
+        if m == 0:
+            return _reduce(powers[k], q, [0])
+        product = poly_multiply(q, self.divisor)
+        r = _strip([dividend[i] * powers[k] - product[i] for i in range(k, n + 1)])
+        return _reduce(powers[k], q, r)
+
+def coefficients_text(coeffs, var="x", denominator=1):
+    """Renders a highest-degree-first coefficient list over a common denominator."""
+    x = symbols(var)
+    poly = Poly.from_list([QQ(v, denominator) for v in coeffs], x, domain=QQ)
+    return to_superscript(str(poly.as_expr()))
+
+def division_text(dividend, divisor, d, quotient, remainder, var="x"):
+    return (f"  Dividend: {coefficients_text(dividend, var)}\n"
+            f"  Divisor: {coefficients_text(divisor, var)}\n"
+            f"  Quotient: {coefficients_text(quotient, var, d)}\n"
+            f"  Remainder: {coefficients_text(remainder, var, d)}\n")
+
+def batch_divide(dividends, divisor, render=False, var="x"):
+    """
+    Divides every dividend by one divisor.  Returns (denominators,
+    quotients, remainders, texts) with d·a = q·b + r for each dividend a,
+    and texts None unless render is set.  Divisors with leading
+    coefficient ±1 and degree at most SYNTHETIC_MAX_DEGREE use
+    synthetic_divide (every d is 1).  Otherwise dividends whose quotient
+    is short next to the divisor share one FixedDivisor inverse, and the
+    rest use pseudo_divide: over the integers the inverse series'
+    coefficients grow geometrically, so it only pays off there.
+    """
+    divisor = _strip(list(divisor))
+    m = len(divisor) - 1
+    synthetic = abs(divisor[0]) == 1 and m <= SYNTHETIC_MAX_DEGREE
+    fixed = None
+    results = []
+    for a in dividends:
+        a = _strip(list(a))
+        if synthetic:
+            results.append((1,) + synthetic_divide(a, divisor))
+        elif 2 * (len(a) - m) <= m:
+            fixed = fixed or FixedDivisor(divisor)
+            results.append(fixed.divide(a))
+        else:
+            results.append(pseudo_divide(a, divisor))
+    denominators = [d for d, _, _ in results]
+    quotients = [q for _, q, _ in results]
+    remainders = [r for _, _, r in results]
+    texts = None
+    if render:
+        texts = [division_text(a, divisor, *result, var) for a, result in zip(dividends, results)]
+    return denominators, quotients, remainders, texts
+
+def dense_division_chain(f1, f2):
+    """
+    The clean_integer_division_chain steps on integer coefficient lists.
+    Each step scales the dividend so its leading coefficient is a multiple
+    of the divisor's, divides exactly over QQ (kept as an integer quotient
+    over the denominator d) and clears the remainder's denominators.
+    Returns (steps, remainder) with steps as (multiplier, scaled, quotient,
+    d, remainder) tuples.
+    """
+    steps = []
+    current = _strip(list(f1))
+    if not any(f2):
+        return steps, current
+    f2 = _strip(list(f2))
+    while any(current) and len(current) >= len(f2):
+        lc1, lc2 = current[0], f2[0]
+        multiplier = (abs(lc1 * lc2) // math.gcd(lc1, lc2)) // lc1
+        scaled = [multiplier * c for c in current]
+        if abs(lc2) == 1:
+            (q, r), d = synthetic_divide(scaled, f2), 1
+        else:
+            d, q, r = pseudo_divide(scaled, f2)
+        # r/d is the QQ remainder; the lcm of its denominators is
+        # d / gcd(d, content(r)).
+        clean = [c // math.gcd(d, _content(r)) for c in r]
+        steps.append((multiplier, scaled, q, d, clean))
+        current = clean
+    return steps, current
+
+def _dense_to_poly_chain(f1, f2, var):
+    steps, remainder = dense_division_chain([int(c) for c in f1.all_coeffs()],
+                                            [int(c) for c in f2.all_coeffs()])
+    quotient_total = Poly(0, var, domain=QQ)
+    records = []
+    for multiplier, scaled, q, d, clean in steps:
+        quotient = Poly.from_list([QQ(c, d) for c in q], var, domain=QQ)
+        records.append({
+            'multiplier': S(multiplier),
+            'scaled_f1': Poly.from_list(scaled, var, domain=ZZ),
+            'quotient': quotient,
+            'remainder': Poly.from_list(clean, var, domain=ZZ)
+        })
+        quotient_total += quotient
+    return quotient_total, Poly.from_list(remainder, var, domain=ZZ), records
+
+def _sparse_to_poly_chain(f1, f2, vars):
+    steps, remainder = sparse_division_chain({e: int(c) for e, c in f1.terms()},
+                                             {e: int(c) for e, c in f2.terms()})
+    zero = (0,) * len(vars)
+
+    def to_poly(terms, domain):
+        if domain == QQ:
+            terms = {e: QQ(Fraction(c).numerator, Fraction(c).denominator) for e, c in terms.items()}
+        return Poly.from_dict(terms or {zero: 0}, *vars, domain=domain)
+
+    quotient_total = Poly(0, *vars, domain=QQ)
+    records = []
+    for multiplier, scaled, q, clean in steps:
+        quotient = to_poly(q, QQ)
+        records.append({
+            'multiplier': S(multiplier),
+            'scaled_f1': to_poly(scaled, ZZ),
+            'quotient': quotient,
+            'remainder': to_poly(clean, ZZ)
+        })
+        quotient_total += quotient
+    return quotient_total, to_poly(remainder, ZZ), records
+
 def clean_integer_division_chain(f1, f2, vars):
+    # Integer polynomials take the dense engine in one variable and the
+    # sparse heap division (lex, in the order of vars) in several; rational
+    # coefficients go through sympy.
+    if f1.domain == ZZ and f2.domain == ZZ and not f2.is_zero:
+        if len(vars) == 1:
+            return _dense_to_poly_chain(f1, f2, vars[0])
+        return _sparse_to_poly_chain(f1, f2, vars)
+    return sympy_division_chain(f1, f2, vars)
+
+def sympy_division_chain(f1, f2, vars):
     quotient_total = Poly(0, *vars)
     steps = []
     current_f1 = f1
@@ -120,7 +423,7 @@ def perform_polynomial_division(f1_input: str, f2_input: str) -> str:
         if not all_symbols:
             return "❌ Error: No variables found in expressions."
 
-        vars = symbols([str(s) for s in all_symbols])
+        vars = symbols(sorted(str(s) for s in all_symbols))
         f1 = Poly(sympify(f1_input), *vars)
         f2 = Poly(sympify(f2_input), *vars)
 
@@ -151,21 +454,53 @@ def perform_polynomial_division(f1_input: str, f2_input: str) -> str:
 
     return output
 
+def perform_modular_division(f1_input: str, f2_input: str, p: int) -> str:
+    output = ""
+    try:
+        all_symbols = sorted(str(s) for s in sympify(f1_input + '+' + f2_input).free_symbols)
+        if not all_symbols:
+            return "❌ Error: No variables found in expressions."
+        if len(all_symbols) > 1:
+            return "❌ Error: Division mod p needs polynomials in one variable."
+        var = symbols(all_symbols[0])
+        numerator = gf_from_rationals(Poly(sympify(f1_input), var).all_coeffs(), p)
+        denominator = gf_from_rationals(Poly(sympify(f2_input), var).all_coeffs(), p)
+        if not denominator.any():
+            return f"❌ Error: The denominator is zero mod {p}."
+        quotient, remainder = gf_divmod(numerator, denominator, p)
+
+        output += f"\nPerforming polynomial long division over GF({p}):\n"
+        output += f"Numerator: {coefficients_text(numerator.tolist(), var.name)}\n"
+        output += f"Denominator: {coefficients_text(denominator.tolist(), var.name)}\n\n"
+        output += "--- Final Result ---\n"
+        output += f"  Quotient: {coefficients_text(quotient.tolist(), var.name)}\n"
+        output += f"  Remainder: {coefficients_text(remainder.tolist(), var.name)}\n\n"
+    except ZeroDivisionError:
+        output += f"\n❌ Error: A coefficient's denominator is divisible by {p}.\n"
+    except Exception as e:
+        output += f"\n❌ Error: {e}\n"
+
+    return output
+
 def main(user_input=None):
     """
     Accepts input string like: "x^3 - 6x^2 + 11x - 6, x - 1"
-    Parses it and calls perform_polynomial_division().
+    Parses it and calls perform_polynomial_division(), or
+    perform_modular_division() when it ends in "mod p".
     """
-    old_stdout = sys.stdout
-    sys.stdout = mystdout = StringIO()
+    out = StringIO()
 
     try:
-        print("\n=== Polynomial Long Division ===")
+        print("\n=== Polynomial Long Division ===", file=out)
 
         if not user_input or ',' not in user_input:
-            print("❌ Invalid input format. Use: <numerator>, <denominator>")
-            sys.stdout = old_stdout
-            return mystdout.getvalue()
+            print("❌ Invalid input format. Use: <numerator>, <denominator>", file=out)
+            return out.getvalue()
+
+        user_input, modulus, error = split_modulus(user_input)
+        if error:
+            print(error, file=out)
+            return out.getvalue()
 
         # Split and sanitize input
         parts = [p.strip() for p in user_input.split(',', 1)]
@@ -173,11 +508,13 @@ def main(user_input=None):
         f2_str = fix_expression(parts[1])
 
         # Perform division
-        result = perform_polynomial_division(f1_str, f2_str)
-        print(result)
+        if modulus:
+            result = perform_modular_division(f1_str, f2_str, modulus)
+        else:
+            result = perform_polynomial_division(f1_str, f2_str)
+        print(result, file=out)
 
     except Exception as e:
-        print(f"❌ Unexpected error: {e}")
-    finally:
-        sys.stdout = old_stdout
-        return mystdout.getvalue()
+        print(f"❌ Unexpected error: {e}", file=out)
+
+    return out.getvalue()
@@ -1,6 +1,16 @@
 import re
 import math
+import numbers
 from fractions import Fraction
+from functools import lru_cache
+
+from factorization import square_part
+
+@lru_cache(maxsize=64)
+def _term_patterns(var):
+    pattern_a = re.compile(rf'([+-]?\d*\.?\d*){var}²')
+    pattern_b = re.compile(rf'([+-]?\d*\.?\d*){var}(?![^\d]*²)')
+    return pattern_a, pattern_b
 
 def parse_quadratic(equation_str):
     eq = equation_str.replace('−', '-').replace('–', '-').replace(' ', '')
@@ -9,9 +19,7 @@ def parse_quadratic(equation_str):
 
     a = b = c = 0
 
-    pattern_a = re.compile(rf'([+-]?\d*\.?\d*){var}²')
-    pattern_b = re.compile(rf'([+-]?\d*\.?\d*){var}(?![^\d]*²)')
-    pattern_c = re.compile(rf'([+-]?\d+)(?![^\d{var}])')
+    pattern_a, pattern_b = _term_patterns(var)
 
     match_a = pattern_a.search(eq)
     if match_a:
@@ -32,17 +40,14 @@ def parse_quadratic(equation_str):
     return int(a), int(b), int(c), var
 
 def simplify_sqrt(n):
+    # (coeff, inner) with √n = coeff·√inner.  Exact unless n has a cofactor
+    # past TRIAL_LIMIT³ hiding a large square, which square_part may miss, so
+    # the radical is then correct but not always fully simplified.
     if n == 0:
         return (0, 1)
     if n < 0:
         return 1, abs(n)
-    m = int(math.floor(math.sqrt(n)))
-    for i in range(m, 0, -1):
-        if n % (i * i) == 0:
-            outside = i
-            inside = n // (i * i)
-            return outside, inside
-    return 1, n
+    return square_part(n)
 
 def format_root(b, sqrt_coeff, sqrt_inner, a, sign='+'):
     b_val = -b
@@ -101,6 +106,15 @@ def format_root(b, sqrt_coeff, sqrt_inner, a, sign='+'):
             return num_str.strip()
         return f"({num_str.strip()}) / {denom_simplified}"
 
+def format_complex_root(b, sqrt_coeff, sqrt_inner, a, sign='+'):
+    b_val = -b
+    denom = 2 * a
+    common = math.gcd(math.gcd(abs(int(b_val)), abs(int(sqrt_coeff))), abs(int(denom)))
+    b_part = int(b_val // common)
+    sc_part = int(sqrt_coeff // common)
+    denom_part = int(denom // common)
+    return f"({b_part} {sign} {sc_part}√{sqrt_inner}i) / {denom_part}"
+
 def solve_quadratic_verbose_return(a, b, c, var):
     output = []
     output.append(f"\nGiven quadratic equation: {a}{var}² + ({b}){var} + ({c}) = 0")
@@ -115,15 +129,6 @@ def solve_quadratic_verbose_return(a, b, c, var):
         coeff, inner = simplify_sqrt(abs_d)
         output.append(f"Step 2: √D = √({discriminant}) = {coeff}√{inner}i (simplified)")
 
-        def format_complex_root(b, sqrt_coeff, sqrt_inner, a, sign='+'):
-            b_val = -b
-            denom = 2 * a
-            common = math.gcd(math.gcd(abs(int(b_val)), abs(int(sqrt_coeff))), abs(int(denom)))
-            b_part = int(b_val // common)
-            sc_part = int(sqrt_coeff // common)
-            denom_part = int(denom // common)
-            return f"({b_part} {sign} {sc_part}√{sqrt_inner}i) / {denom_part}"
-
         root1_str = format_complex_root(b, coeff, inner, a, '+')
         root2_str = format_complex_root(b, coeff, inner, a, '-')
 
@@ -172,6 +177,81 @@ def solve_quadratic_verbose_return(a, b, c, var):
 
         return "\n".join(output)
 
+NOT_QUADRATIC, COMPLEX_ROOTS, REPEATED_ROOT, REAL_ROOTS = -2, -1, 0, 1
+
+def solve_quadratic_batch(a, b, c):
+    """
+    Solves a·x² + b·x + c = 0 for whole coefficient arrays at once.
+    Returns (kind, root1, root2): kind holds REAL_ROOTS, REPEATED_ROOT,
+    COMPLEX_ROOTS or NOT_QUADRATIC (a == 0, roots NaN) per row, and the
+    roots are complex128.  Real roots use q = -(b + sign(b)·√D)/2,
+    x1 = q/a, x2 = c/q, so neither root suffers cancellation.
+    """
+    import numpy as np
+    a, b, c = np.broadcast_arrays(np.asarray(a, dtype=float),
+                                  np.asarray(b, dtype=float),
+                                  np.asarray(c, dtype=float))
+    discriminant = b * b - 4 * a * c
+    kind = np.select([a == 0, discriminant < 0, discriminant == 0],
+                     [NOT_QUADRATIC, COMPLEX_ROOTS, REPEATED_ROOT], REAL_ROOTS).astype(np.int8)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sqrt_d = np.sqrt(np.abs(discriminant))
+        q = -0.5 * (b + np.where(b < 0, -1.0, 1.0) * sqrt_d)
+        real1 = q / a
+        real2 = np.where(q != 0, c / q, real1)
+        centre = -b / (2 * a)
+        spread = sqrt_d / (2 * np.abs(a))
+        root1 = np.where(kind == COMPLEX_ROOTS, centre + 1j * spread, real1 + 0j)
+        root2 = np.where(kind == COMPLEX_ROOTS, centre - 1j * spread, real2 + 0j)
+    root1[kind == NOT_QUADRATIC] = np.nan
+    root2[kind == NOT_QUADRATIC] = np.nan
+    return kind, root1, root2
+
+def radical_roots(a, b, c):
+    """Both roots of integer a·x² + b·x + c = 0 in simplified radical form."""
+    discriminant = b ** 2 - 4 * a * c
+    if discriminant < 0:
+        coeff, inner = simplify_sqrt(abs(int(discriminant)))
+        return (format_complex_root(b, coeff, inner, a, '+'),
+                format_complex_root(b, coeff, inner, a, '-'))
+    if discriminant == 0:
+        root = str(Fraction(-b, 2 * a))
+        return root, root
+    root_d = math.isqrt(int(discriminant))
+    if root_d * root_d == discriminant:
+        coeff, inner = root_d, 1
+    else:
+        coeff, inner = simplify_sqrt(int(discriminant))
+    return format_root(b, coeff, inner, a, '+'), format_root(b, coeff, inner, a, '-')
+
+def _exact_fraction(value):
+    # Integers stay exact; floats are read as the decimal they print as, so
+    # 0.1 is 1/10 rather than its binary expansion.
+    if isinstance(value, numbers.Integral):
+        return Fraction(int(value))
+    return Fraction(repr(float(value)))
+
+def exact_root_forms(a, b, c, rows=None):
+    """
+    Lazily yields (row, root1, root2) radical strings for the requested rows
+    of a batch, so the exact forms are only built for rows someone asks for.
+    Decimal coefficients are scaled to integers first, which keeps the
+    roots; rows with a non-finite coefficient get None forms.
+    """
+    rows = range(len(a)) if rows is None else rows
+    for i in rows:
+        try:
+            coeffs = [_exact_fraction(v[i]) for v in (a, b, c)]
+        except (OverflowError, ValueError):
+            yield i, None, None
+            continue
+        if coeffs[0] == 0:
+            yield i, None, None
+            continue
+        scale = math.lcm(*(f.denominator for f in coeffs))
+        yield (i, *radical_roots(*(int(f * scale) for f in coeffs)))
+
 def main(equation_str):
     try:
         a, b, c, var = parse_quadratic(equation_str)
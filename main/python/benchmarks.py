@@ -0,0 +1,410 @@
+"""
+Timing harness for the solver engines.
+
+Usage: python benchmarks.py <name> [<name> ...]
+Each benchmark returns its report as a string, like the module entry points.
+"""
+import random
+import sys
+import time
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def _random_primes(count, bits, rng):
+    from sympy import isprime
+    primes = set()
+    while len(primes) < count:
+        candidate = rng.getrandbits(bits) | (1 << (bits - 1)) | 1
+        if isprime(candidate):
+            primes.add(candidate)
+    return list(primes)
+
+
+def _classic_crt(congruences):
+    # The original crt_solver arithmetic: one full-size M // m_i per congruence.
+    from CRT import linear_congruence_solver
+    M = 1
+    for a, m in congruences:
+        M *= m
+    x = 0
+    for a, m in congruences:
+        M_i = M // m
+        x += a * M_i * linear_congruence_solver(M_i, 1, m)
+    return x % M, M
+
+
+def bench_crt(sizes=(10, 100, 1000, 10000, 100000), bit_sizes=(64, 256), classic_limit=10000, seed=1):
+    import CRT
+    rng = random.Random(seed)
+    output = "CRT: product tree vs balanced merge vs classic M // m_i\n"
+    output += f"{'n':>8} {'bits':>5} {'tree':>10} {'coprime':>10} {'merge':>10} {'classic':>10}\n"
+    for bits in bit_sizes:
+        for n in sizes:
+            moduli = _random_primes(n, bits, rng)
+            congruences = [(rng.randrange(m), m) for m in moduli]
+
+            t_tree, (x, M) = _timed(CRT.crt_tree_solver, congruences)
+            t_coprime, _ = _timed(CRT.pairwise_coprime, moduli)
+            t_merge, (r, L, _, _) = _timed(CRT.merge_congruences, congruences)
+            assert (x, M) == (r, L)
+            if n <= classic_limit:
+                t_classic, classic = _timed(_classic_crt, congruences)
+                assert classic == (x, M)
+                classic_str = f"{t_classic:10.4f}"
+            else:
+                classic_str = f"{'-':>10}"
+            output += f"{n:>8} {bits:>5} {t_tree:10.4f} {t_coprime:10.4f} {t_merge:10.4f} {classic_str}\n"
+    return output
+
+
+def _recursive_gcd(a, m):
+    # The recursive extended Euclid that congruence and CRT used to carry.
+    if m == 0:
+        return a, 1, 0
+    gcd_val, p_prime, q_prime = _recursive_gcd(m, a % m)
+    return gcd_val, q_prime, p_prime - (a // m) * q_prime
+
+
+def bench_xgcd(digit_sizes=(10, 100, 1000, 5000, 10000), repeats=5, seed=1):
+    import congruence
+    from xgcd import xgcd, parse_int
+    rng = random.Random(seed)
+    output = "Extended gcd: iterative/Lehmer xgcd vs recursive Euclid\n"
+    output += f"{'digits':>8} {'xgcd':>10} {'recursive':>10} {'congruence.main':>16}\n"
+    for digits in digit_sizes:
+        # Decimal text first: past 4300 digits str() of the ints would raise.
+        texts = [[str(rng.randrange(1, 10)) + "".join(rng.choices("0123456789", k=digits - 1))
+                  for _ in range(2)] for _ in range(repeats)]
+        pairs = [(parse_int(a), parse_int(m)) for a, m in texts]
+        t_fast, fast = _timed(lambda: [xgcd(a, m) for a, m in pairs])
+        try:
+            t_slow, slow = _timed(lambda: [_recursive_gcd(a, m) for a, m in pairs])
+            assert slow == fast
+            slow_str = f"{t_slow / repeats:10.5f}"
+        except RecursionError:
+            slow_str = f"{'RecursionError':>10}"
+        a, m = texts[0]
+        t_main, _ = _timed(congruence.main, f"{a} {a} {m}")
+        output += f"{digits:>8} {t_fast / repeats:10.5f} {slow_str} {t_main:16.5f}\n"
+    return output
+
+
+def bench_quad(sizes=(1000, 10000, 100000, 1000000), string_limit=10000, seed=1):
+    import numpy as np
+    import Quad
+    rng = np.random.default_rng(seed)
+    output = "Quadratics: solve_quadratic_batch vs Quad.main per string\n"
+    output += f"{'n':>8} {'batch':>10} {'strings':>10}\n"
+    for n in sizes:
+        a = rng.integers(1, 100, n) * rng.choice([-1, 1], n)
+        b = rng.integers(-1000, 1000, n)
+        c = rng.integers(-1000, 1000, n)
+        t_batch, _ = _timed(Quad.solve_quadratic_batch, a, b, c)
+        if n <= string_limit:
+            equations = [f"{ai}x²{bi:+d}x{ci:+d}" for ai, bi, ci in zip(a.tolist(), b.tolist(), c.tolist())]
+            t_strings, _ = _timed(lambda: [Quad.main(eq) for eq in equations])
+            strings_str = f"{t_strings:10.4f}"
+        else:
+            strings_str = f"{'-':>10}"
+        output += f"{n:>8} {t_batch:10.4f} {strings_str}\n"
+    return output
+
+
+CUBIC_INPUTS = [
+    "x^3 - 6x^2 + 11x - 6", "2x^3 - 3x^2 - 11x + 6", "x^3 - 2x^2 - 2x",
+    "x^3 - x - 1", "x^3 - 2", "4x^3 - 12x^2 + 5x + 3", "x^3 + 3x^2 - 7x + 11",
+]
+
+
+def bench_cubic(repeats=3):
+    import cubic
+    output = "Cubics: find_roots_fast vs find_roots_from_expr (sympy solve + simplify)\n"
+    output += f"{'expression':<24} {'fast ms':>10} {'symbolic ms':>12}\n"
+    for expr in CUBIC_INPUTS:
+        t_fast, _ = _timed(lambda: [cubic.find_roots_fast(expr) for _ in range(repeats)])
+        t_slow, _ = _timed(lambda: [cubic.find_roots_from_expr(expr) for _ in range(repeats)])
+        output += f"{expr:<24} {1000 * t_fast / repeats:10.2f} {1000 * t_slow / repeats:12.2f}\n"
+    return output
+
+
+PROJ_INPUTS = ["(x+1)^2 - x²", "(2a+3b)(a-b)^2", "x³ - 6x² + 11x - 6", "(x^2 - y^2)/(x - y)", "3xy(x+2)(y-1)"]
+
+
+def bench_proj_parse(rounds=5):
+    # Each expression goes through all four modes, as a user session would.
+    import proj
+    modes = ["expand", "simplify", "factor", "substitute"]
+    calls = [(expr if mode != "substitute" else f"{expr}; x=2, y=3, a=1, b=5", mode)
+             for expr in PROJ_INPUTS for mode in modes]
+
+    def parse_only():
+        proj.clear_parse_cache()
+        for expr in PROJ_INPUTS:
+            proj._parse_expression_string(expr)
+
+    def run(cold):
+        for _ in range(rounds):
+            for arg, mode in calls:
+                if cold:
+                    proj.clear_parse_cache()
+                proj.main(arg, mode)
+
+    t_parse, _ = _timed(lambda: [parse_only() for _ in range(rounds)])
+    t_cold, _ = _timed(run, True)
+    proj.clear_parse_cache()
+    t_warm, _ = _timed(run, False)
+    parses = rounds * len(calls)
+    output = "proj: parse share of latency, four modes per expression\n"
+    output += f"parse alone: {1000 * t_parse / (rounds * len(PROJ_INPUTS)):.2f} ms per expression\n"
+    output += (f"before (no cache): {t_cold:.3f}s, parse share "
+               f"{100 * t_parse * len(modes) / t_cold:.1f}%\n")
+    output += (f"after  (shared):   {t_warm:.3f}s, parse share "
+               f"{100 * t_parse / t_warm / rounds:.1f}%, {parses} lookups\n")
+    output += f"cache: {proj.parse_cache_stats()}\n"
+    return output
+
+
+GRID_EXPRESSION = "(x+y)^3 * xy + (x+y)^2/(1+xy) - 3x/(y+2)"
+
+
+def bench_proj_grid(sizes=(1000, 100000, 1000000), subs_limit=1000, seed=1):
+    import numpy as np
+    import proj
+    rng = np.random.default_rng(seed)
+    output = f"proj: substitute_grid vs substitute_expr per point\n{GRID_EXPRESSION}\n"
+    output += f"{'points':>8} {'compile+eval':>13} {'eval':>10} {'subs loop':>12}\n"
+    for n in sizes:
+        columns = {"x": rng.random(n), "y": rng.random(n)}
+        proj._compiled.cache_clear()
+        t_first, (values, error) = _timed(proj.substitute_grid, GRID_EXPRESSION, columns)
+        assert error is None and values.shape == (n,)
+        t_eval, _ = _timed(proj.substitute_grid, GRID_EXPRESSION, columns)
+        if n <= subs_limit:
+            points = [f"{GRID_EXPRESSION}; x={xv}, y={yv}"
+                      for xv, yv in zip(columns["x"].tolist(), columns["y"].tolist())]
+            t_subs, _ = _timed(lambda: [proj.substitute_expr(p) for p in points])
+            subs_str = f"{t_subs:12.4f}"
+        else:
+            subs_str = f"{'-':>12}"
+        output += f"{n:>8} {t_first:13.4f} {t_eval:10.4f} {subs_str}\n"
+    return output
+
+
+def bench_poly_div(degrees=(10, 50, 200, 500, 1000, 2000), sympy_limit=200, seed=1):
+    import Poly_long_div
+    from sympy import Poly, symbols
+    x = symbols("x")
+    rng = random.Random(seed)
+    output = "Poly_long_div: dense pseudo-division vs sympy simplify/div chain\n"
+    output += f"{'degree':>8} {'dense':>10} {'dense+Poly':>11} {'sympy':>10}\n"
+    for n in degrees:
+        f1 = [rng.randint(-99, 99) or 1 for _ in range(n + 1)]
+        f2 = [rng.randint(2, 9)] + [rng.randint(-99, 99) for _ in range(n // 2)]
+        t_dense, _ = _timed(Poly_long_div.dense_division_chain, f1, f2)
+        p1, p2 = Poly(f1, x), Poly(f2, x)
+        t_poly, (q, r, _) = _timed(Poly_long_div.clean_integer_division_chain, p1, p2, [x])
+        if n <= sympy_limit:
+            t_sympy, (q_ref, r_ref, _) = _timed(Poly_long_div.sympy_division_chain, p1, p2, [x])
+            assert (q, r) == (q_ref, r_ref)
+            sympy_str = f"{t_sympy:10.4f}"
+        else:
+            sympy_str = f"{'-':>10}"
+        output += f"{n:>8} {t_dense:10.4f} {t_poly:11.4f} {sympy_str}\n"
+    return output
+
+
+def bench_poly_batch(count=1000, degree=200, divisor_degrees=(1, 4, 50, 140), seed=1):
+    # One fixed divisor, many dividends: the batch path (synthetic division
+    # or the shared inverse) against calling pseudo_divide on each dividend.
+    import Poly_long_div
+    rng = random.Random(seed)
+    dividends = [[rng.randint(1, 99)] + [rng.randint(-99, 99) for _ in range(degree)] for _ in range(count)]
+    output = f"Poly_long_div: {count} dividends of degree {degree} by one divisor\n"
+    output += f"{'divisor':>12} {'batch':>10} {'pseudo':>10}\n"
+    for m in divisor_degrees:
+        for lc in (1, 3):
+            divisor = [lc] + [rng.randint(-9, 9) for _ in range(m)]
+            t_batch, (denominators, quotients, remainders, _) = _timed(
+                Poly_long_div.batch_divide, dividends, divisor)
+            t_pseudo, reference = _timed(lambda: [Poly_long_div.pseudo_divide(a, divisor) for a in dividends])
+            assert list(zip(denominators, quotients, remainders)) == reference
+            output += f"{f'deg {m}, lc {lc}':>12} {t_batch:10.4f} {t_pseudo:10.4f}\n"
+    return output
+
+
+def bench_sparse_div(nvars_list=(3, 4, 5, 6), terms=100, max_exp=20, sympy_vars=3, seed=1):
+    # f = q·g + r with about terms² ≈ 10^4 terms; the heap division must
+    # satisfy f = Q·g + R exactly in both orders.
+    import sparse_poly
+    rng = random.Random(seed)
+    output = f"Sparse division: q·g + r with {terms}-term q and g\n"
+    output += f"{'vars':>5} {'f terms':>8} {'lex':>8} {'grevlex':>8} {'sympy div':>10}\n"
+    for n in nvars_list:
+        def random_poly(count):
+            return {tuple(rng.randint(0, max_exp) for _ in range(n)): rng.choice([-1, 1]) * rng.randint(1, 99)
+                    for _ in range(count)}
+        g, q, r = random_poly(terms), random_poly(terms), random_poly(terms // 10)
+        f = sparse_poly.sparse_multiply(q, g)
+        for e, c in r.items():
+            f[e] = f.get(e, 0) + c
+        f = {e: c for e, c in f.items() if c}
+        times = []
+        for order in ("lex", "grevlex"):
+            t, (quotient, remainder) = _timed(sparse_poly.sparse_divide, f, g, order)
+            check = sparse_poly.sparse_multiply(quotient, g)
+            for e, c in remainder.items():
+                check[e] = check.get(e, 0) + c
+            assert {e: c for e, c in check.items() if c} == f
+            times.append(t)
+        if n <= sympy_vars:
+            from sympy import Poly, symbols
+            gens = symbols(f"x:{n}")
+            t_sympy, _ = _timed(lambda: Poly.from_dict(f, *gens).div(Poly.from_dict(g, *gens)))
+            sympy_str = f"{t_sympy:10.3f}"
+        else:
+            sympy_str = f"{'-':>10}"
+        output += f"{n:>5} {len(f):>8} {times[0]:8.3f} {times[1]:8.3f} {sympy_str}\n"
+    return output
+
+
+def bench_gf_div(degrees=(100, 1000, 10000), primes=(7, 1000003, 2147483647), seed=1):
+    import numpy as np
+    import gf_poly
+    rng = np.random.default_rng(seed)
+    output = "GF(p) division: degree n by degrees 1, 10, n/2; remainder sequence of f, f'\n"
+    output += f"{'p':>11} {'n':>6} {'deg 1':>8} {'deg 10':>8} {'deg n/2':>8} {'sequence':>9}\n"
+    for p in primes:
+        for n in degrees:
+            a = rng.integers(1, p, n + 1)
+            times = []
+            for m in (1, 10, n // 2):
+                times.append(_timed(gf_poly.gf_divmod, a, rng.integers(1, p, m + 1), p)[0])
+            if n <= 1000:
+                t_seq, _ = _timed(gf_poly.gf_remainder_sequence, a, gf_poly.gf_derivative(a, p), p)
+                seq_str = f"{t_seq:9.4f}"
+            else:
+                seq_str = f"{'-':>9}"
+            output += f"{p:>11} {n:>6} " + " ".join(f"{t:8.4f}" for t in times) + f" {seq_str}\n"
+    return output
+
+
+def bench_sturm_prs(degrees=(20, 50, 100, 200), sympy_limit=20, seed=1):
+    import sturm_final
+    from sympy import Poly
+    rng = random.Random(seed)
+    output = "Sturm sequence: primitive PRS vs lcm/simplify/div chain\n"
+    output += f"{'degree':>8} {'prs':>10} {'max bits':>9} {'sympy':>10} {'max bits':>9}\n"
+    for n in degrees:
+        f = Poly([rng.randint(1, 99)] + [rng.randint(-99, 99) for _ in range(n)], sturm_final.x)
+        f1 = f.diff(sturm_final.x)
+        t_prs, sequence = _timed(sturm_final.sturm_sequence_fraction_free, f, f1)
+        bits = max(abs(int(c)).bit_length() for p in sequence for c in p.all_coeffs())
+        if n <= sympy_limit:
+            t_sympy, reference = _timed(sturm_final.sympy_sturm_sequence, f, f1)
+            ref_bits = max(abs(int(c)).bit_length() for p in reference for c in p.all_coeffs())
+            sympy_str = f"{t_sympy:10.3f} {ref_bits:>9}"
+        else:
+            sympy_str = f"{'-':>10} {'-':>9}"
+        output += f"{n:>8} {t_prs:10.3f} {bits:>9} {sympy_str}\n"
+    return output
+
+
+def bench_sturm_signs(degrees=(20, 50, 100, 200), points=500, seed=1):
+    # The old per-point lambdify(math) loop against one certified NumPy pass
+    # and against evaluating every entry exactly.
+    import sturm_final
+    from fractions import Fraction
+    from sympy import Poly, lambdify
+    rng = random.Random(seed)
+    xs = [Fraction(rng.randint(-4000, 4000), 1000) for _ in range(points)]
+    output = f"Sturm sign table at {points} points\n"
+    output += f"{'degree':>8} {'rows':>5} {'numpy':>8} {'exact':>8} {'lambdify':>9} {'disagree':>9}\n"
+    for n in degrees:
+        f = Poly([rng.randint(1, 99)] + [rng.randint(-99, 99) for _ in range(n)], sturm_final.x)
+        sequence = sturm_final.sturm_sequence_fraction_free(f, f.diff(sturm_final.x))
+        rows = [sturm_final.integer_coefficients(p) for p in sequence]
+        t_fast, table = _timed(sturm_final.sign_table_exact, rows, xs)
+        t_exact, exact = _timed(lambda: [[sturm_final.SIGN_SYMBOLS[sturm_final._exact_sign(r, p)] for p in xs]
+                                         for r in rows])
+        assert table == exact
+
+        def old_signs():
+            table = []
+            for poly in sequence:
+                func = lambdify(sturm_final.x, poly.as_expr(), modules="math")
+                row = []
+                for p in xs:
+                    try:
+                        v = func(float(p))
+                        row.append("0" if abs(v) < 1e-9 else "+" if v > 0 else "-")
+                    except (OverflowError, ValueError):
+                        row.append("ERR")
+                table.append(row)
+            return table
+        t_old, old = _timed(old_signs)
+        disagree = sum(a != b for r1, r2 in zip(old, exact) for a, b in zip(r1, r2))
+        output += f"{n:>8} {len(rows):>5} {t_fast:8.3f} {t_exact:8.3f} {t_old:9.3f} {disagree:>9}\n"
+    return output
+
+
+CONCURRENCY_INPUTS = {
+    "trig_calc": ["sin(pi/3)", "acos(-1/2)", "1/0", "cos(pi/5) + tan(pi/8)", "sec(pi/6)"],
+    "Poly_long_div": ["x^3 - 6x^2 + 11x - 6, x - 1", "2x^4 + 3x + 5, x^2 + 1", "x^5 - 1, 3x - 2"],
+    "sturm_final": ["x^3+6x^2+12x+8,-2,-1,0,1,2", "x^4 - 5x^2 + 4", "x^2 - 2, -2, 0, 2"],
+}
+
+
+def bench_concurrency(threads=32, rounds=20):
+    # Stress check rather than a timing: every module call from a thread
+    # pool must return exactly what the same call returns sequentially.
+    import importlib
+    from concurrent.futures import ThreadPoolExecutor
+    jobs = [(name, arg) for name, args in CONCURRENCY_INPUTS.items() for arg in args] * rounds
+    rng = random.Random(1)
+    rng.shuffle(jobs)
+    modules = {name: importlib.import_module(name) for name in CONCURRENCY_INPUTS}
+    expected = {(name, arg): modules[name].main(arg) for name, arg in set(jobs)}
+
+    t_parallel, results = _timed(lambda: list(ThreadPoolExecutor(threads).map(
+        lambda job: modules[job[0]].main(job[1]), jobs)))
+    failures = sum(result != expected[job] for job, result in zip(jobs, results))
+    output = f"Concurrency: {len(jobs)} calls on {threads} threads in {t_parallel:.3f}s\n"
+    output += "✅ every output intact\n" if failures == 0 else f"❌ {failures} corrupted outputs\n"
+    return output
+
+
+BENCHMARKS = {
+    "crt": bench_crt,
+    "xgcd": bench_xgcd,
+    "concurrency": bench_concurrency,
+    "quad": bench_quad,
+    "cubic": bench_cubic,
+    "proj_parse": bench_proj_parse,
+    "proj_grid": bench_proj_grid,
+    "poly_div": bench_poly_div,
+    "poly_batch": bench_poly_batch,
+    "sparse_div": bench_sparse_div,
+    "gf_div": bench_gf_div,
+    "sturm_prs": bench_sturm_prs,
+    "sturm_signs": bench_sturm_signs,
+}
+
+
+def main(names=None):
+    output = ""
+    for name in names or list(BENCHMARKS):
+        bench = BENCHMARKS.get(name)
+        if bench is None:
+            output += f"❌ Unknown benchmark '{name}'. Available: {', '.join(BENCHMARKS)}\n"
+            continue
+        output += bench() + "\n"
+    return output
+
+
+if __name__ == "__main__":
+    print(main(sys.argv[1:]))
@@ -1,10 +1,102 @@
-def gcd(a, m):
-    if m == 0:
-        return a, 1, 0
-    gcd_val, p_prime, q_prime = gcd(m, a % m)
-    p = q_prime
-    q = p_prime - (a // m) * q_prime
-    return gcd_val, p, q
+from xgcd import xgcd as gcd, parse_int, int_text
+
+def _mulmod(x, y, m):
+    # x * y mod m elementwise for uint64 arrays with x, y < m < 2**63, by
+    # double-and-add so no intermediate leaves 64 bits.
+    import numpy as np
+    if m.size == 0 or int(m.max()) < (1 << 31):
+        return x * y % m
+    result = np.zeros_like(x)
+    x = x.copy()
+    y = y.copy()
+    while y.any():
+        odd = (y & 1).astype(bool)
+        result = np.where(odd, (result + x) % m, result)
+        x = (x + x) % m
+        y >>= 1
+    return result
+
+def solve_batch(a, b, m):
+    """
+    Solves a*x ≡ b (mod m) for whole arrays of int64 triples at once.
+    Returns (x0, d, solvable): d = gcd(a, m), and where solvable is True,
+    x0 is the smallest non-negative solution; all solutions are
+    x0 + k*(|m|/d).  Rows with m == 0 are marked unsolvable.
+    """
+    import numpy as np
+    a, b, m = np.broadcast_arrays(np.asarray(a, dtype=np.int64),
+                                  np.asarray(b, dtype=np.int64),
+                                  np.asarray(m, dtype=np.int64))
+    m = np.abs(m)
+    valid = m != 0
+    m_safe = np.where(valid, m, 1)
+
+    # Vectorized extended Euclid on (a mod m, m), tracking only the
+    # coefficient of a: a*s0 ≡ r0 (mod m) throughout.
+    r0, r1 = a % m_safe, m_safe.copy()
+    s0, s1 = np.ones_like(r0), np.zeros_like(r0)
+    active = r1 != 0
+    while active.any():
+        q = r0 // np.where(active, r1, 1)
+        r0, r1 = np.where(active, r1, r0), np.where(active, r0 - q * r1, r1)
+        s0, s1 = np.where(active, s1, s0), np.where(active, s0 - q * s1, s1)
+        active = r1 != 0
+
+    d = r0
+    b_mod = b % m_safe
+    solvable = valid & (b_mod % d == 0)
+    step = m_safe // d
+    x0 = _mulmod((b_mod // d % step).astype(np.uint64),
+                 (s0 % step).astype(np.uint64),
+                 step.astype(np.uint64)).astype(np.int64)
+    x0 = np.where(solvable, x0, 0)
+    d = np.where(valid, d, 0)
+    return x0, d, solvable
+
+MAX_LISTED_SOLUTIONS = 100
+
+class CongruenceSolution:
+    """
+    Result of a*x ≡ b (mod m).  The d = gcd(a, m) solutions form the
+    arithmetic progression x(j) = (x0 + j*m/d) mod m, which is computed on
+    demand, so asking for x(10**6) or a page of lines needs O(1) memory.
+    """
+
+    def __init__(self, a, b, m):
+        self.a, self.b, self.m = a, b, m
+        self.d, self.p, self.q = gcd(a, m)
+        self.solvable = b % self.d == 0
+        self.x0 = (b * self.p // self.d) % m if self.solvable else None
+
+    @property
+    def step(self):
+        return self.m // self.d
+
+    @property
+    def count(self):
+        return abs(self.d) if self.solvable else 0
+
+    def __getitem__(self, j):
+        if j < 0:
+            j += self.count
+        if not 0 <= j < self.count:
+            raise IndexError("solution index out of range")
+        return (self.x0 + (self.m * j) // self.d) % self.m
+
+    def __iter__(self):
+        for j in range(self.count):
+            yield self[j]
+
+    def lines(self, start=0, count=None):
+        stop = self.count if count is None else min(self.count, start + count)
+        for j in range(start, stop):
+            yield f"x({j}) = {int_text(self[j])} (mod {int_text(self.m)})\n"
+
+    def render(self, start=0, count=None):
+        return "".join(self.lines(start, count))
+
+def solve(a, b, m):
+    return CongruenceSolution(a, b, m)
 
 def main(arg=None):
     output = ""
@@ -16,26 +108,27 @@ def main(arg=None):
         if len(parts) != 3:
             return "❌ Invalid input. Please enter: a b m"
 
-        a, b, m = map(int, parts)
+        a, b, m = map(parse_int, parts)
         if m == 0:
             return "❌ Modulus 'm' cannot be zero."
 
-        output += f"Solving linear congruence: {a}x ≡ {b} (mod {m})\n"
+        output += f"Solving linear congruence: {int_text(a)}x ≡ {int_text(b)} (mod {int_text(m)})\n"
 
-        d, p, q = gcd(a, m)
-        output += f"GCD({a}, {m}) = {d}\n"
-        output += f"Coefficients: p = {p}, q = {q}\n"
-        output += f"Verification: {a} * {p} + {m} * {q} = {a*p + m*q}\n"
+        solution = solve(a, b, m)
+        d, p, q = solution.d, solution.p, solution.q
+        output += f"GCD({int_text(a)}, {int_text(m)}) = {int_text(d)}\n"
+        output += f"Coefficients: p = {int_text(p)}, q = {int_text(q)}\n"
+        output += f"Verification: {int_text(a)} * {int_text(p)} + {int_text(m)} * {int_text(q)} = {int_text(a*p + m*q)}\n"
 
-        if b % d != 0:
+        if not solution.solvable:
             output += "❌ No solution exists since b is not divisible by GCD(a, m)\n"
         else:
-            x0 = (b * p // d) % m
-            output += f"x(0) = {x0}\n"
+            output += f"x(0) = {int_text(solution.x0)}\n"
             output += "✅ All solutions:\n"
-            for j in range(d):
-                xj = (x0 + (m * j) // d) % m
-                output += f"x({j}) = {xj} (mod {m})\n"
+            output += solution.render(0, MAX_LISTED_SOLUTIONS)
+            if solution.count > MAX_LISTED_SOLUTIONS:
+                output += (f"... {solution.count - MAX_LISTED_SOLUTIONS} more solutions: "
+                           f"x(j) = ({int_text(solution.x0)} + j*{int_text(m)}/{int_text(d)}) mod {int_text(m)}\n")
 
     except Exception as e:
         output += f"⚠️ Error: {e}"
@@ -1,6 +1,11 @@
-from sympy import symbols, sympify, simplify, solve, expand
+from sympy import symbols, sympify, simplify, solve, expand, Poly, Rational
+from fractions import Fraction
+from math import gcd
+import cmath
 import re
 
+from factorization import factorize_within
+
 x = symbols('x')
 
 def preprocess(expr):
@@ -32,21 +37,261 @@ def find_roots_from_expr(expr_str):
         for i, r in enumerate(roots, 1):
             r_simplified = simplify(r)
             approx = r_simplified.evalf()
-            output += f"Root {i}: {r_simplified} ≈ {approx:.6f}\n"
+            output += f"Root {i}: {r_simplified} ≈ {_format_complex(complex(approx))}\n"
 
         return output
 
     except Exception as e:
         return f"⚠️ Error parsing or solving the expression: {e}\n"
 
+TERM_PATTERN = re.compile(r'^(\d+(?:\.\d*)?(?:/\d+)?)?\*?(x(?:\*\*(\d+))?)?$')
+
+def cubic_coefficients(expr_str):
+    """
+    Coefficients [a3, a2, a1, a0] as Fractions, read straight off the
+    preprocessed string when it is a plain sum of c*x**n terms, otherwise
+    from sympy's Poly (still without simplify or solve).  Returns None when
+    a coefficient is not rational.
+    """
+    text = preprocess(expr_str).replace(" ", "")
+    coeffs = {}
+    for sign, term in re.findall(r'([+-]?)([^+-]+)', text):
+        match = TERM_PATTERN.match(term)
+        if not match or not (match.group(1) or match.group(2)):
+            coeffs = None
+            break
+        value = Fraction(match.group(1)) if match.group(1) else Fraction(1)
+        power = 0 if not match.group(2) else int(match.group(3) or 1)
+        coeffs[power] = coeffs.get(power, 0) + (-value if sign == '-' else value)
+    if coeffs is None:
+        poly = Poly(sympify(text), x)
+        if not all(c.is_Rational for c in poly.all_coeffs()):
+            return None
+        coeffs = {poly.degree() - i: Fraction(int(c.p), int(c.q)) for i, c in enumerate(poly.all_coeffs())}
+    degree = max((p for p, c in coeffs.items() if c != 0), default=0)
+    return [coeffs.get(p, Fraction(0)) for p in range(degree, -1, -1)]
+
+# rational_roots gives up, and find_roots_fast falls back to sympy, when a
+# coefficient will not factor within this many rho steps or the candidate
+# list would be longer than this.
+RATIONAL_ROOT_STEPS = 1 << 16
+MAX_CANDIDATES = 1 << 14
+
+def _divisors(n):
+    factors = factorize_within(n, RATIONAL_ROOT_STEPS)
+    if factors is None:
+        return None
+    divisors = [1]
+    for p, e in factors:
+        divisors = [d * p ** k for d in divisors for k in range(e + 1)]
+        if len(divisors) > MAX_CANDIDATES:
+            return None
+    return divisors
+
+def rational_roots(int_coeffs):
+    """
+    Distinct rational roots of an integer polynomial, by the rational root
+    theorem, or None when the candidates are beyond the budget above.
+    """
+    roots = []
+    coeffs = list(int_coeffs)
+    while coeffs and coeffs[-1] == 0:
+        coeffs.pop()
+        if Fraction(0) not in roots:
+            roots.append(Fraction(0))
+    if len(coeffs) < 2:
+        return roots
+    lead, const = abs(coeffs[0]), abs(coeffs[-1])
+    n = len(coeffs) - 1
+    leads, consts = _divisors(lead), _divisors(const)
+    if leads is None or consts is None or len(leads) * len(consts) > MAX_CANDIDATES:
+        return None
+    for q in leads:
+        for p in consts:
+            if gcd(p, q) != 1:
+                continue
+            for cand in (p, -p):
+                if sum(c * cand ** (n - i) * q ** i for i, c in enumerate(coeffs)) == 0:
+                    root = Fraction(cand, q)
+                    if root not in roots:
+                        roots.append(root)
+    return roots
+
+def _deflate(coeffs, root):
+    # Synthetic division by (x - root) over the rationals.
+    out = [coeffs[0]]
+    for c in coeffs[1:-1]:
+        out.append(c + out[-1] * root)
+    return out
+
+def _to_integers(coeffs):
+    from math import lcm
+    scale = lcm(*(c.denominator for c in coeffs))
+    ints = [int(c * scale) for c in coeffs]
+    common = gcd(*ints) or 1
+    # A positive leading coefficient keeps the radical forms readable.
+    if ints[0] < 0:
+        common = -common
+    return [c // common for c in ints]
+
+def _format_complex(z):
+    if abs(z.imag) < 1e-12:
+        return f"{z.real:.6f}"
+    return f"{z.real:.6f} {'+' if z.imag >= 0 else '-'} {abs(z.imag):.6f}i"
+
+def _numeric_cubic_roots(coeffs):
+    import numpy as np
+    return [complex(r) for r in np.roots([float(c) for c in coeffs])]
+
+def find_roots_fast(expr_str, symbolic=False):
+    """
+    Rational-root theorem first, then the quadratic formula on the deflated
+    factor, and numeric companion-matrix roots for irreducible cubics.
+    sympy radicals for those are only built when symbolic is True.
+    """
+    output = ""
+    try:
+        coeffs = cubic_coefficients(expr_str)
+        if coeffs is None:
+            return find_roots_from_expr(expr_str)
+        degree = len(coeffs) - 1
+        if degree != 3:
+            return f"❌ The equation is degree {degree}, not a cubic.\n"
+
+        int_coeffs = _to_integers(coeffs)
+        output += f"📘 Parsed Expression: {Poly([Rational(c.numerator, c.denominator) for c in coeffs], x).as_expr()}\n"
+
+        roots = []
+        found = rational_roots(int_coeffs)
+        if found is None:
+            return find_roots_from_expr(expr_str)
+        remaining = [Fraction(c) for c in int_coeffs]
+        for r in found:
+            roots.append((str(r), complex(r)))
+            remaining = _deflate(remaining, r)
+            while len(remaining) > 1 and sum(c * r ** (len(remaining) - 1 - i) for i, c in enumerate(remaining)) == 0:
+                remaining = _deflate(remaining, r)
+
+        if len(remaining) == 3:
+            import Quad
+            a, b, c = _to_integers(remaining)
+            exact = Quad.radical_roots(a, b, c)
+            disc = b * b - 4 * a * c
+            values = [(-b + cmath.sqrt(disc)) / (2 * a), (-b - cmath.sqrt(disc)) / (2 * a)]
+            # Every rational root was deflated away, so this factor is
+            # irreducible and its two roots are distinct.
+            roots.extend(zip(exact, values))
+        elif len(remaining) == 4:
+            if symbolic:
+                for r in solve(Poly(int_coeffs, x).as_expr(), x):
+                    roots.append((str(r), complex(r.evalf())))
+            else:
+                roots.extend((None, z) for z in _numeric_cubic_roots(int_coeffs))
+
+        roots.sort(key=lambda root: (abs(root[1].imag) > 1e-12, root[1].real, root[1].imag))
+        output += "\n✅ Roots of the equation:\n"
+        for i, (exact, value) in enumerate(roots, 1):
+            if exact is None:
+                output += f"Root {i}: ≈ {_format_complex(value)}\n"
+            else:
+                output += f"Root {i}: {exact} ≈ {_format_complex(value)}\n"
+        return output
+
+    except Exception as e:
+        return f"⚠️ Error parsing or solving the expression: {e}\n"
+
+CUBIC_CHUNK = 1 << 18
+
+def _solve_cubic_chunk(coeffs):
+    import numpy as np
+    a, b, c, d = (coeffs[:, i].astype(float) for i in range(4))
+    valid = a != 0
+    a = np.where(valid, a, 1.0)
+    B, C, D = b / a, c / a, d / a
+
+    # Depressed cubic t³ + p·t + q with x = t - B/3.
+    p = C - B * B / 3
+    q = 2 * B ** 3 / 27 - B * C / 3 + D
+    disc = (q / 2) ** 2 + (p / 3) ** 3
+    scale = (q / 2) ** 2 + np.abs(p / 3) ** 3
+    repeated = np.abs(disc) <= 1e-12 * scale
+    three_real = (disc < 0) & ~repeated
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Three distinct real roots: trigonometric form.
+        r = 2 * np.sqrt(np.where(three_real, -p / 3, 0))
+        cos_arg = np.where(three_real, 3 * q / (2 * p) * np.sqrt(np.where(three_real, -3 / p, 0)), 0)
+        phi = np.arccos(np.clip(cos_arg, -1, 1)) / 3
+        trig = np.stack([r * np.cos(phi - 2 * np.pi * k / 3) for k in range(3)], axis=1)
+
+        # One real root: Cardano, choosing the sign that avoids cancellation.
+        u = np.cbrt(-q / 2 - np.where(q < 0, -1, 1) * np.sqrt(np.maximum(disc, 0)))
+        v = np.where(u != 0, -p / (3 * u), 0)
+        half = -(u + v) / 2
+        im = np.abs(np.sqrt(3) / 2 * (u - v))
+        cardano = np.stack([u + v + 0j, half + 1j * im, half - 1j * im], axis=1)
+
+        # Repeated roots: a triple root at 0, or 3q/p and a double -3q/(2p).
+        simple = np.where(p != 0, 3 * q / p, 0)
+        double = np.where(p != 0, -3 * q / (2 * p), 0)
+        multiple = np.stack([simple, double, double], axis=1)
+
+    t = np.where(three_real[:, None], trig + 0j, np.where(repeated[:, None], multiple + 0j, cardano))
+    roots = t - (B / 3)[:, None]
+
+    # One Newton step on the monic cubic tightens the closed forms; rows with
+    # repeated roots are skipped because f' vanishes there.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        Bc, Cc, Dc = B[:, None], C[:, None], D[:, None]
+        f = ((roots + Bc) * roots + Cc) * roots + Dc
+        fp = (3 * roots + 2 * Bc) * roots + Cc
+        step = np.where((np.abs(fp) > 1e-300) & ~repeated[:, None], f / fp, 0)
+    roots = roots - np.nan_to_num(step)
+
+    roots[~valid] = np.nan
+    all_real = (three_real | repeated) & valid
+    return roots, all_real, repeated & valid
+
+def iter_cubic_batches(coeffs, chunk_size=CUBIC_CHUNK):
+    """
+    Yields (start, roots, all_real, repeated) for successive chunks of an
+    (N, 4) coefficient array (a, b, c, d of a·x³ + b·x² + c·x + d), so that
+    only one chunk of intermediates is alive at a time.  roots is
+    (n, 3) complex; rows with a == 0 are NaN and flagged False.
+    """
+    for start in range(0, len(coeffs), chunk_size):
+        yield (start, *_solve_cubic_chunk(coeffs[start:start + chunk_size]))
+
+def solve_cubic_batch(coeffs, chunk_size=CUBIC_CHUNK, out=None):
+    """
+    Roots of every row of an (N, 4) coefficient array as an (N, 3) complex
+    array plus per-row all_real and repeated flags.  Pass out (for example a
+    np.memmap) to keep even the result off the heap for very large N.
+    """
+    import numpy as np
+    coeffs = np.asarray(coeffs)
+    n = len(coeffs)
+    roots = out if out is not None else np.empty((n, 3), dtype=complex)
+    all_real = np.empty(n, dtype=bool)
+    repeated = np.empty(n, dtype=bool)
+    for start, chunk_roots, chunk_real, chunk_repeated in iter_cubic_batches(coeffs, chunk_size):
+        stop = start + len(chunk_roots)
+        roots[start:stop] = chunk_roots
+        all_real[start:stop] = chunk_real
+        repeated[start:stop] = chunk_repeated
+    return roots, all_real, repeated
+
 # Accept an optional argument
-def main(expr_str=None):
+def main(expr_str=None, mode="symbolic"):
     if expr_str is None:
         print("🔍 Cubic Equation Root Finder")
         print("Enter a cubic polynomial like: x^3 - 6x^2 + 11x - 6\n")
         expr_str = input("Enter the expression: ")
 
-    result = find_roots_from_expr(expr_str)
+    if mode == "fast":
+        result = find_roots_fast(expr_str)
+    else:
+        result = find_roots_from_expr(expr_str)
     print(result)
     return result  # Return for programmatic use
 
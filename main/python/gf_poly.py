@@ -0,0 +1,113 @@
+"""
+Univariate polynomial arithmetic over GF(p) for Poly_long_div and
+sturm_final.
+
+Polynomials are NumPy int64 coefficient arrays, highest degree first, with
+entries in [0, p).  The prime must satisfy (p - 1)² < 2⁶³ so a product of
+two residues never overflows; each division step is then one vectorized
+multiply-and-subtract over the divisor's length, with the reduction mod p
+deferred for as many steps as int64 allows.
+
+Both modules take the modulus as a trailing option on their usual input,
+e.g. "x^3 - 6x^2 + 11x - 6, x - 1 mod 7".
+"""
+import re
+
+from factorization import is_probable_prime
+
+MOD_PATTERN = re.compile(r"\s+mod\s+(\S+)\s*$", re.IGNORECASE)
+MAX_PRIME = 3037000499  # isqrt(2**63 - 1)
+
+
+def split_modulus(user_input):
+    """
+    Strips a trailing 'mod p' option.  Returns (rest, p, error) with p None
+    when the option is absent.
+    """
+    match = MOD_PATTERN.search(user_input)
+    if not match:
+        return user_input, None, None
+    try:
+        p = int(match.group(1))
+    except ValueError:
+        return user_input, None, f"❌ Invalid modulus '{match.group(1)}'. Use: mod p with p prime."
+    if not is_probable_prime(p):
+        return user_input, None, f"❌ Modulus {p} is not prime."
+    if p > MAX_PRIME:
+        return user_input, None, f"❌ Modulus {p} is too large (at most {MAX_PRIME})."
+    return user_input[:match.start()], p, None
+
+
+def gf_strip(a):
+    nonzero = a.nonzero()[0]
+    return a[nonzero[0]:] if len(nonzero) else a[-1:] * 0
+
+
+def gf_from_rationals(coeffs, p):
+    """
+    Reduces int, Fraction or sympy Rational coefficients mod p; sympy Floats
+    are read as the decimal typed, 0.5 -> 1/2.  Raises ZeroDivisionError
+    when a denominator is divisible by p.
+    """
+    import numpy as np
+    from sympy import Rational
+    residues = []
+    for c in coeffs:
+        if getattr(c, "is_Float", False):
+            c = Rational(str(c))
+        if c.denominator % p == 0:
+            raise ZeroDivisionError(f"denominator {c.denominator} is divisible by {p}")
+        residues.append(c.numerator * pow(c.denominator, -1, p) % p)
+    return gf_strip(np.array(residues or [0], dtype=np.int64))
+
+
+def gf_divmod(a, b, p):
+    """Quotient and remainder of a by b over GF(p)."""
+    import numpy as np
+    a, b = gf_strip(a), gf_strip(b)
+    if not b.any():
+        raise ZeroDivisionError("polynomial division by zero")
+    n, m = len(a) - 1, len(b) - 1
+    if n < m or not a.any():
+        return np.zeros(1, dtype=np.int64), a
+    inverse = pow(int(b[0]), -1, p)
+    monic = b * inverse % p
+    r = a.copy()
+    q = np.zeros(n - m + 1, dtype=np.int64)
+    # Entries may sink by up to (p - 1)² per step; reduce the window the
+    # step touches only when it could leave int64.
+    headroom = (2 ** 63 - 1 - p) // max((p - 1) ** 2, 1)
+    pending = 0
+    for i in range(n - m + 1):
+        c = int(r[i]) % p
+        if c:
+            if pending == headroom:
+                r[i:i + m + 1] %= p
+                pending = 0
+            q[i] = c
+            r[i:i + m + 1] -= c * monic
+            pending += 1
+    r %= p
+    return q * inverse % p, gf_strip(r[n - m + 1:]) if m else np.zeros(1, dtype=np.int64)
+
+
+def gf_derivative(a, p):
+    import numpy as np
+    n = len(a) - 1
+    if n == 0:
+        return np.zeros(1, dtype=np.int64)
+    powers = np.arange(n, 0, -1, dtype=np.int64) % p
+    return gf_strip(a[:-1] * powers % p)
+
+
+def gf_remainder_sequence(f, g, p):
+    """
+    Sturm-style sequence f, g, -rem(f, g), ... over GF(p), ending with the
+    zero polynomial as sturm_sequence_fraction_free does.  The last non-zero
+    entry is gcd(f, g) up to a unit.
+    """
+    sequence = [gf_strip(f), gf_strip(g)]
+    while sequence[-1].any():
+        _, r = gf_divmod(sequence[-2], sequence[-1], p)
+        sequence.append((-r) % p)
+    return sequence
@@ -1,11 +1,32 @@
 import importlib
+import json
+import os
+import socketserver
+import sys
 
-def execute_module(name):
+from result_cache import ResultCache
+
+MODULES = ["congruence", "CRT", "cubic", "multiplier", "sturm_final",
+           "trig_calc", "proj", "Poly_long_div", "Quad"]
+DEFAULT_SOCKET = os.path.join(os.environ.get("TMPDIR", "/tmp"), "alphamath.sock")
+
+# Set ALPHAMATH_CACHE_DB to a file path to add the persistent cache tier.
+RESULT_CACHE = ResultCache(disk_path=os.environ.get("ALPHAMATH_CACHE_DB"))
+
+def call_entry_point(module, arg=None, mode=None):
+    if arg is None:
+        return module.main()
+    if mode is not None:
+        return module.main(arg, mode)
+    return module.main(arg)
+
+def execute_module(name, arg=None, mode=None):
     output = ""
     try:
         module = importlib.import_module(name)
         if hasattr(module, 'main'):
-            result = module.main()
+            result = RESULT_CACHE.cached_call(name, arg, mode,
+                                              lambda: call_entry_point(module, arg, mode))
             if result is not None:
                 output += result
         elif hasattr(module, 'evaluate_custom_expression_manual_steps'):
@@ -48,6 +69,160 @@ def main():
     output += execute_module(module_name)
     return output
 
+def _parse_request(line):
+    # Returns (module, arg, mode) from one JSON request line, raising
+    # ValueError unless it is an object with a string "module" and string or
+    # null "arg" and "mode".
+    request = json.loads(line)
+    if not isinstance(request, dict):
+        raise ValueError("expected a JSON object")
+    name, arg, mode = request.get("module"), request.get("arg"), request.get("mode")
+    if not isinstance(name, str):
+        raise ValueError("'module' must be a string")
+    for key, value in (("arg", arg), ("mode", mode)):
+        if value is not None and not isinstance(value, str):
+            raise ValueError(f"'{key}' must be a string or null")
+    return name, arg, mode
+
+class _DispatchHandler(socketserver.StreamRequestHandler):
+    # One JSON object per line in each direction:
+    #   {"module": "CRT", "arg": "2 3 3 5", "mode": null}  ->  {"output": "..."}
+    # Every request line gets exactly one response line.
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                name, arg, mode = _parse_request(line)
+                if name not in self.server.modules:
+                    response = {"error": f"Unknown module '{name}'. Available: {', '.join(MODULES)}"}
+                else:
+                    response = {"output": execute_module(name, arg, mode)}
+            except ValueError as e:
+                response = {"error": f"Invalid request: {e}"}
+            except Exception as e:
+                response = {"error": f"{type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+def _remove_stale_socket(socket_path):
+    # Only a socket nobody answers on is removed: any other file is left
+    # alone, and a live dispatcher is reported rather than replaced.
+    import socket
+    import stat
+    try:
+        mode = os.stat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{socket_path} exists and is not a socket")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except OSError:
+            os.unlink(socket_path)
+            return
+    raise FileExistsError(f"A dispatcher is already listening on {socket_path}")
+
+def serve(socket_path=DEFAULT_SOCKET):
+    """
+    Imports every calculator module once and answers requests over a Unix
+    domain socket, so each call skips interpreter start-up and sympy import.
+    """
+    _remove_stale_socket(socket_path)
+    server = socketserver.ThreadingUnixStreamServer(socket_path, _DispatchHandler)
+    server.daemon_threads = True
+    server.modules = {name: importlib.import_module(name) for name in MODULES}
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+def request(module, arg=None, mode=None, socket_path=DEFAULT_SOCKET):
+    """Thin client for serve(): sends one request and returns the module output."""
+    import socket
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        payload = {"module": module, "arg": arg, "mode": mode}
+        sock.sendall(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reader:
+            response = json.loads(reader.readline())
+    if "error" in response:
+        return f"❌ {response['error']}\n"
+    return response["output"]
+
+def _warm_worker():
+    for name in MODULES:
+        importlib.import_module(name)
+
+def _run_batch_line(line):
+    # Never raises: a bad line becomes an error record, so one request cannot
+    # abort the whole batch.
+    try:
+        name, arg, mode = _parse_request(line)
+        if name not in MODULES:
+            response = {"module": name, "error": f"Unknown module '{name}'"}
+        else:
+            response = {"module": name, "output": execute_module(name, arg, mode)}
+    except ValueError as e:
+        response = {"error": f"Invalid request: {e}"}
+    except Exception as e:
+        response = {"error": f"{type(e).__name__}: {e}"}
+    return json.dumps(response, ensure_ascii=False)
+
+def run_batch(input_path, output_path=None, workers=None, chunk_size=16, progress=sys.stderr):
+    """
+    Replays a JSONL file of {"module", "arg", "mode"} requests on a process
+    pool and writes one JSONL result per request, in input order.  Input is
+    read one window of workers * chunk_size * 4 lines at a time, so memory
+    stays bounded however long the file is.  Returns (count, seconds).
+    """
+    import multiprocessing
+    import time
+    from itertools import islice
+
+    workers = workers or os.cpu_count() or 1
+    window = workers * chunk_size * 4
+    count = 0
+    start = time.perf_counter()
+    out = open(output_path, "w", encoding="utf-8") if output_path else sys.stdout
+    try:
+        with open(input_path, encoding="utf-8") as src, \
+                multiprocessing.Pool(workers, initializer=_warm_worker) as pool:
+            lines = (line for line in src if line.strip())
+            while True:
+                batch = list(islice(lines, window))
+                if not batch:
+                    break
+                for result in pool.imap(_run_batch_line, batch, chunksize=chunk_size):
+                    out.write(result + "\n")
+                count += len(batch)
+                if progress is not None:
+                    elapsed = time.perf_counter() - start
+                    progress.write(f"\r{count} requests, {count / elapsed:.1f} req/s")
+                    progress.flush()
+    finally:
+        if output_path:
+            out.close()
+    elapsed = time.perf_counter() - start
+    if progress is not None:
+        progress.write(f"\rDone: {count} requests in {elapsed:.2f}s ({count / elapsed if elapsed else 0:.1f} req/s)\n")
+    return count, elapsed
+
 if __name__ == "__main__":
-    result = main()
-    print(result)
+    # python main.py                         run the hard-coded menu choice
+    # python main.py serve [socket]          start the warm dispatcher
+    # python main.py call <module> [arg] [mode]
+    # python main.py batch <requests.jsonl> [results.jsonl] [workers]
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        serve(*sys.argv[2:3])
+    elif len(sys.argv) > 2 and sys.argv[1] == "batch":
+        run_batch(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None,
+                  int(sys.argv[4]) if len(sys.argv) > 4 else None)
+    elif len(sys.argv) > 2 and sys.argv[1] == "call":
+        print(request(*sys.argv[2:5]))
+    else:
+        result = main()
+        print(result)
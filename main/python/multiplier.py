@@ -3,6 +3,71 @@ def gcd(a, b):
         a, b = b, a % b
     return a
 
+BATCH_CHUNK = 1 << 16
+
+def _as_chunks(values, chunk_size):
+    # Yields int64 arrays of at most chunk_size items from a scalar, array or
+    # any (possibly endless) iterable of integers.
+    import numpy as np
+    from itertools import islice
+    if isinstance(values, np.ndarray):
+        for i in range(0, values.size, chunk_size):
+            yield values.ravel()[i:i + chunk_size].astype(np.int64)
+        return
+    it = iter(values)
+    while True:
+        chunk = np.fromiter(islice(it, chunk_size), dtype=np.int64)
+        if chunk.size == 0:
+            return
+        yield chunk
+
+def _limbs(value):
+    # Most significant first, 16 bits each.
+    limbs = []
+    while value:
+        limbs.append(value & 0xFFFF)
+        value >>= 16
+    return limbs[::-1]
+
+def _shared_residues(shared, limbs, values):
+    # |shared| mod |values| elementwise.  A shared operand beyond int64 is
+    # reduced from its precomputed 16-bit limbs by a vectorized Horner pass.
+    import numpy as np
+    moduli = np.where(values == 0, 1, np.abs(values))
+    shared = abs(shared)
+    if shared < (1 << 63):
+        return np.int64(shared) % moduli
+    if int(moduli.max()) >= (1 << 47):
+        return np.array([shared % int(v) for v in moduli], dtype=np.int64)
+    residues = np.zeros_like(moduli)
+    for limb in limbs:
+        residues = (residues * 65536 + limb) % moduli
+    return residues
+
+def batch_multipliers(shared, values, shared_is_num1=True, chunk_size=BATCH_CHUNK):
+    """
+    Streams (num1, num2, c) for one fixed operand against many others, where
+    c is the smallest multiplier making num1 × c divisible by num2.  The
+    gcds are computed chunk by chunk with np.gcd; c is None when num2 == 0.
+    """
+    import numpy as np
+    limbs = _limbs(abs(shared)) if abs(shared) >= (1 << 63) else None
+    for chunk in _as_chunks(values, chunk_size):
+        common = np.gcd(_shared_residues(shared, limbs, chunk), chunk)
+        if shared_is_num1:
+            multipliers = (np.abs(chunk) // np.maximum(common, 1)).tolist()
+            for value, c in zip(chunk.tolist(), multipliers):
+                yield shared, value, c if value != 0 else None
+        else:
+            # gcd(0, shared) is |shared| itself, so a zero num1 needs c = 1.
+            for value, g in zip(chunk.tolist(), common.tolist()):
+                yield value, shared, (abs(shared) // g if g else 1) if shared != 0 else None
+
+def format_batch_result(num1, num2, c):
+    if c is None:
+        return f"{num1} × ? : ❌ Cannot divide by zero.\n"
+    return f"{num1} × {c} = {num1 * c}, divisible by {num2}\n"
+
 def main(arg=None):
     output = ""
 
@@ -1,6 +1,9 @@
-from sympy import expand, simplify, factor, sympify, symbols
+from sympy import expand, simplify, factor, sympify, symbols, cancel, together
 from sympy.parsing.sympy_parser import parse_expr, standard_transformations, implicit_multiplication_application, convert_xor
 import re
+import threading
+import time
+from functools import lru_cache
 
 # Unicode superscript conversion maps
 unicode_sup_map = str.maketrans("⁰¹²³⁴⁵⁶⁷⁸⁹⁻", "0123456789-")
@@ -32,8 +35,22 @@ def insert_implicit_multiplication_rules(expr_str):
     expr_str = re.sub(r'([a-zA-Z0-9])(\()', r'\1*\2', expr_str)
     return expr_str
 
+PARSE_CACHE_SIZE = 256
+
 def _parse_expression_string(expression_string):
-    expr_str = expression_string.strip()
+    # The modes are usually run one after another on the same input, so the
+    # parsed (immutable) sympy expression is shared through an LRU cache.
+    return _parse_stripped(expression_string.strip())
+
+def parse_cache_stats():
+    info = _parse_stripped.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
+
+def clear_parse_cache():
+    _parse_stripped.cache_clear()
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_stripped(expr_str):
     if not expr_str:
         return None, "❌ Error: Expression cannot be empty."
     expr_str = unicode_to_normal_expr(expr_str)
@@ -56,29 +73,158 @@ def expand_expr(expression_string):
     except Exception as e:
         return f"❌ Error during expansion: {e}"
 
-def simplify_expr(expression_string):
-    parsed_expr, error = _parse_expression_string(expression_string)
-    if error:
-        return error
+# Wall-clock seconds a simplify or factor request may run.  The last tier is
+# the full rewrite the mode promises and runs first, with all but
+# FALLBACK_SHARE of the budget.  Only if it cannot finish do the cheaper
+# tiers run, in order, in what is left, and the one of them with the fewest
+# operations gives the answer.
+SIMPLIFY_BUDGET = 5.0
+FALLBACK_SHARE = 0.2
+SIMPLIFY_TIERS = ("cancel", "together", "expand", "factor", "simplify")
+FACTOR_TIERS = ("factor",)
+
+def _simplify_then_factor(expr):
+    simplified = simplify(expr)
     try:
-        simplified = simplify(parsed_expr)
+        return factor(simplified)
+    except Exception:
+        return simplified
+
+TIER_FUNCTIONS = {
+    "cancel": cancel,
+    "together": together,
+    "expand": expand,
+    "factor": factor,
+    "simplify": _simplify_then_factor,
+}
+
+class BudgetExceeded(BaseException):
+    # A BaseException, so sympy's `except Exception` blocks let it through.
+    pass
+
+class PartialResult(str):
+    # Output of a ladder the budget cut short.  Which tier finished depends
+    # on the clock rather than the input, so memoizing callers skip it.
+    partial = True
+
+def _set_async_exc(thread_id, exc):
+    import ctypes
+    ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_id),
+                                               ctypes.py_object(exc) if exc else None)
+
+class _Deadline:
+    """
+    Runs tiers in the calling thread until time.monotonic() reaches `at`.
+    A timer thread then raises BudgetExceeded in the caller, so a tier that
+    finishes in time pays nothing for the check.  Nothing is forked, which
+    keeps this safe inside the Android app and the threaded daemon.  Without
+    ctypes a running tier is not interrupted; the deadline is then only
+    checked before each tier.
+    """
+
+    def __init__(self, at):
+        self.at = at
+        self._thread_id = threading.get_ident()
+        self._lock = threading.Lock()
+        self._armed = self._fired = False
+        try:
+            import ctypes
+            self._interruptible = hasattr(ctypes, "pythonapi")
+        except ImportError:
+            self._interruptible = False
+
+    def _fire(self):
+        with self._lock:
+            if self._armed:
+                _set_async_exc(self._thread_id, BudgetExceeded)
+                self._fired = True
+
+    def run(self, func, expr):
+        remaining = self.at - time.monotonic()
+        if remaining <= 0:
+            raise BudgetExceeded
+        if not self._interruptible:
+            return func(expr)
+        self._armed, self._fired = True, False
+        timer = threading.Timer(remaining, self._fire)
+        timer.daemon = True
+        timer.start()
         try:
-            factored_after_simplify = factor(simplified)
-            return normal_to_unicode_expr(str(factored_after_simplify))
-        except Exception:
-            return normal_to_unicode_expr(str(simplified))
+            return func(expr)
+        finally:
+            with self._lock:
+                self._armed = False
+                if self._fired:
+                    # The tier finished as the timer fired: drop the raise.
+                    _set_async_exc(self._thread_id, None)
+            timer.cancel()
+
+def run_ladder(expr, tiers=SIMPLIFY_TIERS, budget=SIMPLIFY_BUDGET):
+    """
+    Runs the rewrite tiers on expr within a wall-clock budget and returns
+    (result, tier, errors, timed_out): the chosen result and its tier (None,
+    None if no tier finished), the error text of any tier that failed, and
+    whether the budget ran out.
+    """
+    from sympy import count_ops
+    start = time.monotonic()
+    full, fallbacks = tiers[-1], tiers[:-1]
+    errors = {}
+    share = 1 - FALLBACK_SHARE if fallbacks else 1
+    try:
+        return _Deadline(start + budget * share).run(TIER_FUNCTIONS[full], expr), full, errors, False
+    except BudgetExceeded:
+        timed_out = True
     except Exception as e:
-        return f"❌ Error during simplification: {e}"
+        errors[full] = str(e)
+        timed_out = False
+
+    deadline = _Deadline(start + budget)
+    best, best_tier, best_ops = None, None, None
+    for name in fallbacks:
+        try:
+            result = deadline.run(TIER_FUNCTIONS[name], expr)
+        except BudgetExceeded:
+            return best, best_tier, errors, True
+        except Exception as e:
+            errors[name] = str(e)
+            continue
+        ops = count_ops(result)
+        if best_ops is None or ops < best_ops:
+            best, best_tier, best_ops = result, name, ops
+    return best, best_tier, errors, timed_out
 
-def factor_expr(expression_string):
+def tiered_expr(expression_string, mode="simplify", budget=SIMPLIFY_BUDGET):
+    """
+    simplify or factor within the budget.  Returns (text, tier, timed_out):
+    the rendered result and the tier that produced it, the input as typed
+    and None when no tier finished in time, or an error message and None.
+    """
     parsed_expr, error = _parse_expression_string(expression_string)
     if error:
-        return error
-    try:
-        factored = factor(parsed_expr)
-        return normal_to_unicode_expr(str(factored))
-    except Exception as e:
-        return f"❌ Error during factorization: {e}. Not all expressions can be factored."
+        return error, None, False
+    tiers = FACTOR_TIERS if mode == "factor" else SIMPLIFY_TIERS
+    result, tier, errors, timed_out = run_ladder(parsed_expr, tiers, budget)
+    if tier is None:
+        if errors and not timed_out:
+            if mode == "factor":
+                return f"❌ Error during factorization: {errors['factor']}. Not all expressions can be factored.", None, False
+            return f"❌ Error during simplification: {next(iter(errors.values()))}", None, False
+        return expression_string.strip(), None, timed_out
+    return normal_to_unicode_expr(str(result)), tier, timed_out
+
+def _tiered_output(expression_string, mode, budget):
+    text, tier, timed_out = tiered_expr(expression_string, mode, budget)
+    if not timed_out:
+        return text
+    shown = f"the {tier} result" if tier else "the input unchanged"
+    return PartialResult(f"{text}\n⚠️ Time budget of {budget:g}s ran out before {mode} finished; showing {shown}.")
+
+def simplify_expr(expression_string, budget=SIMPLIFY_BUDGET):
+    return _tiered_output(expression_string, "simplify", budget)
+
+def factor_expr(expression_string, budget=SIMPLIFY_BUDGET):
+    return _tiered_output(expression_string, "factor", budget)
 
 def substitute_expr(full_input_string):
     parts = full_input_string.split(';', 1)
@@ -127,6 +273,117 @@ def substitute_expr(full_input_string):
     except Exception as e:
         return f"❌ Error during substitution/evaluation: {e}"
 
+MAX_LISTED_POINTS = 100
+
+def load_columns(source):
+    """
+    Reads named value columns for substitute_grid from a CSV file path or an
+    open file whose first row holds the variable names.
+    """
+    import csv
+    import numpy as np
+    handle = open(source, newline='') if isinstance(source, str) else source
+    try:
+        reader = csv.reader(handle)
+        names = [name.strip() for name in next(reader)]
+        rows = []
+        for line_number, row in enumerate(reader, 2):
+            if not row:
+                continue
+            try:
+                rows.append([float(v) for v in row])
+            except ValueError:
+                # The cell itself is not quoted back.
+                raise ValueError(f"non-numeric value on line {line_number}") from None
+        data = np.array(rows, dtype=float)
+    finally:
+        if isinstance(source, str):
+            handle.close()
+    data = data.reshape(-1, len(names))
+    return {name: data[:, i] for i, name in enumerate(names)}
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _compiled(expr_str, names):
+    from sympy import lambdify
+    parsed_expr, error = _parse_stripped(expr_str)
+    if error:
+        return None, error
+    return lambdify(symbols(list(names)), parsed_expr, modules="numpy", cse=True), None
+
+def substitute_grid(expression_string, columns):
+    """
+    Evaluates an expression at many points at once.  columns maps variable
+    names to equal-length value arrays (or scalars), or is a CSV path; the
+    expression is compiled once with lambdify and common-subexpression
+    elimination.  Returns (values, error) like _parse_expression_string:
+    a float array, or an object array of symbolic strings when some
+    variables are left unbound.
+    """
+    import numpy as np
+    if isinstance(columns, str):
+        try:
+            columns = load_columns(columns)
+        except Exception as e:
+            return None, f"❌ Error reading value columns: {e}"
+    parsed_expr, error = _parse_expression_string(expression_string)
+    if error:
+        return None, error
+    try:
+        arrays = {name: np.asarray(values, dtype=float) for name, values in columns.items()}
+        shape = np.broadcast_shapes(*(a.shape for a in arrays.values())) if arrays else ()
+    except Exception as e:
+        return None, f"❌ Error: Invalid value columns: {e}"
+
+    bound = sorted(str(s) for s in parsed_expr.free_symbols if str(s) in arrays)
+    unbound = [s for s in parsed_expr.free_symbols if str(s) not in arrays]
+    if unbound:
+        flat = {name: np.broadcast_to(arrays[name], shape).ravel() for name in bound}
+        size = int(np.prod(shape))
+        results = np.empty(size, dtype=object)
+        for i in range(size):
+            point = {symbols(name): flat[name][i] for name in bound}
+            results[i] = normal_to_unicode_expr(str(parsed_expr.subs(point)))
+        return results.reshape(shape), None
+
+    func, error = _compiled(expression_string.strip(), tuple(bound))
+    if error:
+        return None, error
+    try:
+        with np.errstate(all="ignore"):
+            values = func(*(arrays[name] for name in bound))
+        return np.broadcast_to(np.asarray(values, dtype=float), shape), None
+    except Exception as e:
+        return None, f"❌ Error during grid evaluation: {e}"
+
+def substitute_grid_expr(full_input_string):
+    """
+    Text front end: 'expr; x=1,2,3; y=4,5,6'.  Only inline columns are
+    accepted here; reading a CSV file is left to substitute_grid, so text
+    sent to the app, daemon or batch runner never names a file to open.
+    """
+    parts = full_input_string.split(';', 1)
+    if len(parts) < 2 or '=' not in parts[1]:
+        return "❌ Error: Format: expr; x=1,2,3; y=4,5,6"
+    columns = {}
+    for assignment in parts[1].split(';'):
+        if not assignment.strip():
+            continue
+        if '=' not in assignment:
+            return "❌ Error: Each column must look like var=v1,v2,..."
+        name, values = (part.strip() for part in assignment.split('=', 1))
+        try:
+            columns[name] = [float(v) for v in values.split(',')]
+        except ValueError:
+            return f"❌ Error: Every value for '{name}' must be a number."
+    values, error = substitute_grid(parts[0], columns)
+    if error:
+        return error
+    flat = values.ravel()
+    output = "".join(f"{i}: {v}\n" for i, v in enumerate(flat[:MAX_LISTED_POINTS]))
+    if flat.size > MAX_LISTED_POINTS:
+        output += f"... {flat.size - MAX_LISTED_POINTS} more points\n"
+    return output
+
 def main(argument_string, mode="expand"):
     mode = mode.lower()
     if mode == "expand":
@@ -137,5 +394,7 @@ def main(argument_string, mode="expand"):
         return factor_expr(argument_string)
     elif mode == "substitute":
         return substitute_expr(argument_string)
+    elif mode == "grid":
+        return substitute_grid_expr(argument_string)
     else:
-        return f"❌ Error: Unknown mode '{mode}'. Valid modes: expand, simplify, factor, substitute."
+        return f"❌ Error: Unknown mode '{mode}'. Valid modes: expand, simplify, factor, substitute, grid."
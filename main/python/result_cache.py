@@ -0,0 +1,173 @@
+"""
+Memoization of module results keyed on the input text.
+
+Each module gets only the rewrites its own parser applies before anything
+else and that cannot show in its output, so two inputs share an entry only
+when the module would answer them identically:
+
+    whitespace   runs collapsed to one space for congruence, CRT and
+                 multiplier, which split on whitespace and echo only the
+                 parsed numbers
+    '^'          rewritten to '**' for cubic, Poly_long_div and sturm_final,
+                 which print sympy's form of the input
+    superscripts x² rewritten to x**2 where the module does so itself
+
+Everything else is keyed on the exact string: "2 pi" and "2pi" differ in
+trig_calc, and proj echoes what was typed.
+
+Results live in an in-memory LRU bounded by size.  An optional SQLite file
+adds a persistent tier, shared between processes, that evicts least
+recently used rows once it grows past max_disk_bytes; a trigger keeps the
+running total, so a put never scans the table.
+
+A module whose output depends on wall-clock time returns a str with a true
+`partial` attribute (proj.PartialResult) when its budget cut the work
+short, and that result is not stored.
+"""
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+SUPERSCRIPT_DIGITS = str.maketrans("⁰¹²³⁴⁵⁶⁷⁸⁹", "0123456789")
+
+# module -> (collapse whitespace, '^' to '**', superscript runs to fold)
+CANONICAL_RULES = {
+    "congruence": (True, False, None),
+    "CRT": (True, False, None),
+    "multiplier": (True, False, None),
+    "cubic": (False, True, None),
+    "Poly_long_div": (False, True, re.compile(r"([⁰¹²³⁴⁵⁶⁷⁸⁹]+)")),
+    "sturm_final": (False, True, re.compile(r"(?<=x)([⁰¹²³⁴⁵⁶⁷⁸⁹]+)")),
+}
+EVICT_BATCH = 64
+
+def canonicalize(module, arg):
+    collapse, caret, superscripts = CANONICAL_RULES.get(module, (False, False, None))
+    text = arg
+    if collapse:
+        text = " ".join(text.split())
+    if superscripts is not None:
+        text = superscripts.sub(lambda m: "**" + m.group(1).translate(SUPERSCRIPT_DIGITS), text)
+    if caret:
+        text = text.replace("^", "**")
+    return text
+
+
+def cache_key(module, arg, mode=None):
+    return json.dumps([module, mode, canonicalize(module, arg)], ensure_ascii=False)
+
+
+def _entry_size(key, value):
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+
+class ResultCache:
+    def __init__(self, max_bytes=16 * 1024 * 1024, disk_path=None, max_disk_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "disk_evictions": 0}
+        self._db = None
+        if disk_path:
+            self._db = sqlite3.connect(disk_path, timeout=30, check_same_thread=False)
+            self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT, size INTEGER, used REAL);
+                CREATE INDEX IF NOT EXISTS results_used ON results (used);
+                CREATE TABLE IF NOT EXISTS results_size (id INTEGER PRIMARY KEY CHECK (id = 0), total INTEGER);
+                INSERT OR IGNORE INTO results_size SELECT 0, COALESCE(SUM(size), 0) FROM results;
+                CREATE TRIGGER IF NOT EXISTS results_insert AFTER INSERT ON results
+                    BEGIN UPDATE results_size SET total = total + NEW.size; END;
+                CREATE TRIGGER IF NOT EXISTS results_update AFTER UPDATE OF size ON results
+                    BEGIN UPDATE results_size SET total = total + NEW.size - OLD.size; END;
+                CREATE TRIGGER IF NOT EXISTS results_delete AFTER DELETE ON results
+                    BEGIN UPDATE results_size SET total = total - OLD.size; END;
+            """)
+            self._db.commit()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return self._entries[key]
+            if self._db is not None:
+                digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+                row = self._db.execute("SELECT value FROM results WHERE key = ?", (digest,)).fetchone()
+                if row is not None:
+                    self._db.execute("UPDATE results SET used = ? WHERE key = ?", (time.time(), digest))
+                    self._db.commit()
+                    self._stats["disk_hits"] += 1
+                    self._remember(key, row[0])
+                    return row[0]
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._remember(key, value)
+            if self._db is not None:
+                digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+                self._db.execute("INSERT INTO results VALUES (?, ?, ?, ?) ON CONFLICT (key) DO UPDATE "
+                                 "SET value = excluded.value, size = excluded.size, used = excluded.used",
+                                 (digest, value, len(value.encode("utf-8")), time.time()))
+                self._evict_disk()
+                self._db.commit()
+
+    def _remember(self, key, value):
+        if key in self._entries:
+            self._bytes -= _entry_size(key, self._entries.pop(key))
+        size = _entry_size(key, value)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = value
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            old_key, old_value = self._entries.popitem(last=False)
+            self._bytes -= _entry_size(old_key, old_value)
+            self._stats["evictions"] += 1
+
+    def _evict_disk(self):
+        while self._db.execute("SELECT total FROM results_size").fetchone()[0] > self.max_disk_bytes:
+            rows = self._db.execute("SELECT key FROM results ORDER BY used LIMIT ?", (EVICT_BATCH,)).fetchall()
+            if not rows:
+                break
+            for (digest,) in rows:
+                self._db.execute("DELETE FROM results WHERE key = ?", (digest,))
+                self._stats["disk_evictions"] += 1
+                if self._db.execute("SELECT total FROM results_size").fetchone()[0] <= self.max_disk_bytes:
+                    return
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+
+    def cached_call(self, module, arg, mode, compute):
+        if arg is None:
+            return compute()
+        key = cache_key(module, arg, mode)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if isinstance(value, str) and not getattr(value, "partial", False):
+                self.put(key, value)
+        return value
@@ -0,0 +1,179 @@
+"""
+Sparse multivariate polynomials over the integers for Poly_long_div.
+
+A polynomial is a dict mapping exponent tuples to non-zero coefficients.
+Division follows Monagan and Pearce: exponent vectors are packed into one
+integer whose fields are ordered so that integer comparison is the
+monomial order, and the products q_i·g_j still to be subtracted are merged
+through a heap holding one entry per quotient term, so memory grows with
+the number of terms rather than the dense size.
+
+Packed layout, most significant field first, each field `bits` wide with
+its top bit kept clear as a guard:
+
+    lex      e1, ..., en
+    grevlex  deg, deg - en, ..., deg - e2, e1, ..., en
+
+Every field is linear in the exponents, so multiplying monomials is adding
+the packed integers, and m is divisible by l exactly when m - l leaves
+every exponent field's guard bit clear.
+"""
+import heapq
+import math
+from fractions import Fraction
+
+MONOMIAL_ORDERS = ("lex", "grevlex")
+
+
+class _ExponentOverflow(Exception):
+    pass
+
+
+def monomial_key(exps, order="lex"):
+    """Sort key for an exponent tuple: larger keys are larger monomials."""
+    if order == "grevlex":
+        return (sum(exps),) + tuple(-e for e in reversed(exps))
+    return exps
+
+
+def leading_term(poly, order="lex"):
+    exps = max(poly, key=lambda e: monomial_key(e, order))
+    return exps, poly[exps]
+
+
+def divides(small, big):
+    return all(a <= b for a, b in zip(small, big))
+
+
+def sparse_multiply(a, b):
+    out = {}
+    for ea, ca in a.items():
+        for eb, cb in b.items():
+            e = tuple(x + y for x, y in zip(ea, eb))
+            out[e] = out.get(e, 0) + ca * cb
+    return {e: c for e, c in out.items() if c}
+
+
+class _Packing:
+    def __init__(self, nvars, order, bits):
+        if order not in MONOMIAL_ORDERS:
+            raise ValueError(f"Unknown monomial order '{order}'. Valid orders: {', '.join(MONOMIAL_ORDERS)}.")
+        self.nvars, self.order, self.bits = nvars, order, bits
+        nfields = 2 * nvars if order == "grevlex" else nvars
+        self.mask = (1 << bits) - 1
+        # Guard bits of the exponent fields, which sit at the low end.
+        self.guard = sum(1 << (bits * i + bits - 1) for i in range(nvars))
+        # Top two bits of every field: kept clear on both factors, a sum
+        # can never reach a guard bit.
+        self.headroom = sum(3 << (bits * i + bits - 2) for i in range(nfields))
+
+    def pack(self, exps):
+        if self.order == "grevlex":
+            deg = sum(exps)
+            fields = (deg,) + tuple(deg - e for e in reversed(exps[1:])) + tuple(exps)
+        else:
+            fields = exps
+        value = 0
+        for field in fields:
+            value = (value << self.bits) | field
+        if value & self.headroom:
+            raise _ExponentOverflow
+        return value
+
+    def unpack(self, value):
+        exps = []
+        for _ in range(self.nvars):
+            exps.append(value & self.mask)
+            value >>= self.bits
+        return tuple(reversed(exps))
+
+
+def _heap_divide(f, g, packing):
+    pack = packing.pack
+    g_terms = sorted(((pack(e), c) for e, c in g.items()), reverse=True)
+    f_terms = sorted(((pack(e), c) for e, c in f.items() if c), reverse=True)
+    g_lead, g_lc = g_terms[0]
+    g_tail = len(g_terms)
+    guard, headroom = packing.guard, packing.headroom
+    quotient, remainder = [], []
+    heap = []  # (-(q_i + g_j), i, j): the next product of quotient term i
+    k, nf = 0, len(f_terms)
+    while k < nf or heap:
+        if heap and (k == nf or -heap[0][0] >= f_terms[k][0]):
+            m = -heap[0][0]
+        else:
+            m = f_terms[k][0]
+        c = 0
+        if k < nf and f_terms[k][0] == m:
+            c = f_terms[k][1]
+            k += 1
+        while heap and -heap[0][0] == m:
+            _, i, j = heapq.heappop(heap)
+            c -= quotient[i][1] * g_terms[j][1]
+            if j + 1 < g_tail:
+                heapq.heappush(heap, (-(quotient[i][0] + g_terms[j + 1][0]), i, j + 1))
+        if c == 0:
+            continue
+        diff = m - g_lead
+        if diff & guard:
+            remainder.append((m, c))
+            continue
+        if diff & headroom:
+            raise _ExponentOverflow
+        quotient.append((diff, c // g_lc if c % g_lc == 0 else Fraction(c, g_lc)))
+        if g_tail > 1:
+            heapq.heappush(heap, (-(diff + g_terms[1][0]), len(quotient) - 1, 1))
+    unpack = packing.unpack
+    return ({unpack(e): c for e, c in quotient}, {unpack(e): c for e, c in remainder})
+
+
+def sparse_divide(f, g, order="lex"):
+    """
+    Multivariate division of f by g in the given monomial order.  Returns
+    (q, r) with f = q·g + r and no term of r divisible by the leading
+    monomial of g.  Coefficients are ints, or Fractions where the leading
+    coefficient of g does not divide.
+    """
+    if not g:
+        raise ZeroDivisionError("polynomial division by zero")
+    nvars = len(next(iter(g)))
+    if not f:
+        return {}, {}
+    # Lex division can push exponents past those of f (x^k / (x + y²)
+    # leaves y^2k), so start from a generous width and widen on overflow.
+    degree = max(sum(e) for e in f) + 1
+    bits = max(8, (degree * max(sum(e) for e in g) + degree).bit_length() + 2)
+    while True:
+        try:
+            return _heap_divide(f, g, _Packing(nvars, order, bits))
+        except _ExponentOverflow:
+            bits *= 2
+
+
+def sparse_division_chain(f1, f2, order="lex"):
+    """
+    The clean_integer_division_chain steps on sparse integer polynomials.
+    While some term is divisible by the divisor's leading monomial, scale
+    so the leading coefficients match, divide, and clear the remainder's
+    denominators.  Returns (steps, remainder) with steps as (multiplier,
+    scaled, quotient, remainder) tuples.
+    """
+    steps = []
+    current = {e: c for e, c in f1.items() if c}
+    if not f2:
+        return steps, current
+    lead2, lc2 = leading_term(f2, order)
+    while current and any(divides(lead2, e) for e in current):
+        _, lc1 = leading_term(current, order)
+        multiplier = abs(lc1 * lc2) // math.gcd(lc1, lc2) // lc1
+        scaled = {e: multiplier * c for e, c in current.items()}
+        quotient, remainder = sparse_divide(scaled, f2, order)
+        denominator = 1
+        for c in remainder.values():
+            if isinstance(c, Fraction):
+                denominator = denominator * c.denominator // math.gcd(denominator, c.denominator)
+        clean = {e: int(c * denominator) for e, c in remainder.items()}
+        steps.append((multiplier, scaled, quotient, clean))
+        current = clean
+    return steps, current
+
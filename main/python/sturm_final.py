@@ -1,11 +1,15 @@
-from sympy import symbols, lambdify, Poly
+from sympy import symbols, Poly, Rational
 from sympy.core.backend import sympify
 from sympy import div, lcm, LC, simplify, gcd
+from fractions import Fraction
 from io import StringIO
-import sys, re
+import re
+from gf_poly import split_modulus, gf_from_rationals, gf_derivative, gf_remainder_sequence
+from Poly_long_div import pseudo_divide, _content
 
 x = symbols('x')
-EPSILON = 1e-9
+DEFAULT_POINTS = ["-4", "-3", "-2", "-1", "0", "1", "2", "3", "4"]
+SIGN_SYMBOLS = {1: "+", -1: "-", 0: "0"}
 
 # Mapping from unicode superscripts to regular digits
 superscript_map = str.maketrans("⁰¹²³⁴⁵⁶⁷⁸⁹", "0123456789")
@@ -73,7 +77,47 @@ def fraction_free_division(dividend, divisor):
     clean_remainder = Poly(simplify(remainder_expr * lcm_denoms), x)
     return quotient, clean_remainder
 
+def rational_coefficients(poly):
+    # Coefficients highest degree first, with decimals read as the rational
+    # they print as (0.5 -> 1/2), or None when one is not a number.
+    coeffs = [Rational(str(c)) if c.is_Float else c for c in poly.all_coeffs()]
+    return coeffs if all(c.is_Rational for c in coeffs) else None
+
+def integer_coefficients(poly):
+    # A positive multiple of poly with integer coefficients, highest degree first.
+    coeffs = rational_coefficients(poly)
+    if coeffs is None:
+        raise ValueError(f"coefficients of {poly.as_expr()} are not rational numbers")
+    denominator = 1
+    for c in coeffs:
+        denominator = denominator * int(c.q) // gcd(denominator, int(c.q))
+    return [int(c * denominator) for c in coeffs]
+
+def primitive_prs(f, g):
+    """
+    Sturm sequence f, g, -rem, ... on integer coefficient lists (highest
+    degree first) by the primitive PRS.  pseudo_divide gives d·a = q·b + r
+    with d > 0, so r is a positive multiple of the remainder over QQ;
+    each new entry is the primitive part of -r, which keeps every sign
+    Sturm's theorem reads while the coefficients stay polynomial in size.
+    """
+    sequence = [f, g]
+    while any(sequence[-1]):
+        _, _, r = pseudo_divide(sequence[-2], sequence[-1])
+        content = _content(r)
+        sequence.append([-c // content for c in r] if content else [0])
+    return sequence
+
 def sturm_sequence_fraction_free(f, f1, show_steps=True):
+    if f1.is_zero:
+        return [f, f1]
+    if rational_coefficients(f) is None:
+        return sympy_sturm_sequence(f, f1)
+    sequence = primitive_prs(integer_coefficients(f), integer_coefficients(f1))
+    return [f, f1] + [Poly(coeffs, x) for coeffs in sequence[2:]]
+
+def sympy_sturm_sequence(f, f1):
+    # The lcm/simplify/div-over-QQ construction primitive_prs replaced.
     sequence = [f, f1]
     step = 1
     while True:
@@ -89,6 +133,52 @@ def sturm_sequence_fraction_free(f, f1, show_steps=True):
         step += 1
     return sequence
 
+def _exact_sign(coeffs, point):
+    # sign of q^n · f(p/q) = Σ a_k p^(n-k) q^k by homogeneous Horner, q > 0.
+    p, q = point.numerator, point.denominator
+    h, scale = 0, 1
+    for a in coeffs:
+        h = h * p + a * scale
+        scale *= q
+    return (h > 0) - (h < 0)
+
+def sign_table_exact(sequence, points):
+    """
+    Signs ('+', '-', '0') of each integer coefficient list in sequence
+    (highest degree first) at each Fraction point.  Horner runs for every
+    polynomial at every point in one float64 pass, together with Horner on
+    |a_k| and on 1 at |x|, which bound the rounding error (coefficient and
+    point conversion and underflow included).  Entries whose value does
+    not clear the bound are decided exactly in integers instead.
+    """
+    import numpy as np
+    width = max(len(coeffs) for coeffs in sequence)
+    table = np.zeros((len(sequence), width))
+    for i, coeffs in enumerate(sequence):
+        # Scaling a row by 2^-shift (a correctly rounded int division) puts
+        # its largest coefficient in [1/2, 1) whatever its size, and leaves
+        # every sign alone.
+        shift = max(abs(a) for a in coeffs).bit_length()
+        table[i, width - len(coeffs):] = [a / (1 << shift) for a in coeffs]
+    xs = np.array([float(point) for point in points])
+    values = np.zeros((len(sequence), len(points)))
+    magnitudes = np.zeros_like(values)
+    reach = np.zeros(len(points))
+    with np.errstate(all="ignore"):
+        for j in range(width):
+            values = values * xs + table[:, j:j + 1]
+            magnitudes = magnitudes * np.abs(xs) + np.abs(table[:, j:j + 1])
+            reach = reach * np.abs(xs) + 1
+        u = np.finfo(float).eps / 2
+        k = 3 * width + 2
+        tiny = np.finfo(float).smallest_subnormal
+        bound = 2 * (k * u / (1 - k * u)) * magnitudes + 4 * width * tiny * reach
+        certain = np.isfinite(values) & np.isfinite(bound) & (np.abs(values) > bound)
+    signs = np.where(values > 0, "+", "-").astype(object)
+    for i, j in zip(*np.nonzero(~certain)):
+        signs[i, j] = SIGN_SYMBOLS[_exact_sign(sequence[i], points[j])]
+    return signs.tolist()
+
 def find_root_intervals(x_vals, sign_changes):
     root_intervals = []
     for i in range(len(sign_changes) - 1):
@@ -101,90 +191,107 @@ def count_sign_changes(signs):
     cleaned = [s for s in signs if s != "0" and s != "ERR"]
     return sum((a != b) for a, b in zip(cleaned, cleaned[1:])) if len(cleaned) >= 2 else 0
 
+def print_modular_sequence(f, p, out):
+    # Over GF(p) there are no signs to tabulate; the remainder sequence
+    # itself (and the gcd with f' it ends on) is the result.
+    try:
+        coeffs = gf_from_rationals(f.all_coeffs(), p)
+    except ZeroDivisionError:
+        print(f"A coefficient's denominator is divisible by {p}.", file=out)
+        return
+    if not coeffs.any():
+        print(f"f is zero mod {p}.", file=out)
+        return
+    sequence = gf_remainder_sequence(coeffs, gf_derivative(coeffs, p), p)
+    print(f"--- Sturm Sequence mod {p} ---", file=out)
+    for i, poly in enumerate(sequence):
+        print(f"f{i}(x) = {to_unicode_superscript(Poly.from_list(poly.tolist(), x).as_expr())}", file=out)
+    gcd_degree = len(sequence[-2]) - 1
+    if gcd_degree > 0:
+        print(f"gcd(f, f') mod {p} has degree {gcd_degree}: f has a repeated factor mod {p}.", file=out)
+    else:
+        print(f"gcd(f, f') mod {p} is constant: f is square-free mod {p}.", file=out)
+    print("Sign table skipped: values mod p have no sign.", file=out)
+
 def main(user_input=None):
-    old_stdout = sys.stdout
-    sys.stdout = mystdout = StringIO()
+    out = StringIO()
 
     try:
-        print("\n=== Sturm's Theorem Evaluation ===")
+        print("\n=== Sturm's Theorem Evaluation ===", file=out)
 
         if not user_input or not user_input.strip():
-            print("No input provided. Expected format: polynomial, x1, x2, ...")
-            sys.stdout = old_stdout
-            return mystdout.getvalue()
+            print("No input provided. Expected format: polynomial, x1, x2, ...", file=out)
+            return out.getvalue()
+
+        user_input, modulus, error = split_modulus(user_input)
+        if error:
+            print(error, file=out)
+            return out.getvalue()
 
         parts = [p.strip() for p in user_input.split(',') if p.strip()]
         if len(parts) < 1:
-            print("Input too short.")
-            sys.stdout = old_stdout
-            return mystdout.getvalue()
+            print("Input too short.", file=out)
+            return out.getvalue()
 
         expression_string = parts[0]
         eval_points_strings = parts[1:]
 
         f = parse_polynomial(expression_string)
         if f is None:
-            print("Failed to parse polynomial.")
-            sys.stdout = old_stdout
-            return mystdout.getvalue()
+            print("Failed to parse polynomial.", file=out)
+            return out.getvalue()
 
         f1 = f.diff(x)
-        print(f"Parsed polynomial: f(x) = {to_unicode_superscript(f.as_expr())}")
-        print(f"Derivative: f'(x) = {to_unicode_superscript(f1.as_expr())}")
-
-        x_vals_to_use = [float(s) for s in eval_points_strings] if eval_points_strings else [-4, -3, -2, -1, 0, 1, 2, 3, 4]
-        print("Using evaluation points:", x_vals_to_use)
+        print(f"Parsed polynomial: f(x) = {to_unicode_superscript(f.as_expr())}", file=out)
+        print(f"Derivative: f'(x) = {to_unicode_superscript(f1.as_expr())}", file=out)
+
+        if modulus:
+            print_modular_sequence(f, modulus, out)
+            return out.getvalue()
+
+        # Points are evaluated exactly, so fractions like 1/3 are accepted
+        # and shown as typed; decimals are shown as floats as before.
+        exact_points = [Fraction(s) for s in (eval_points_strings or DEFAULT_POINTS)]
+        if eval_points_strings:
+            x_vals_to_use = [s if '/' in s else float(s) for s in eval_points_strings]
+        else:
+            x_vals_to_use = [int(s) for s in DEFAULT_POINTS]
+        print("Using evaluation points:", x_vals_to_use, file=out)
 
         sequence = sturm_sequence_fraction_free(f, f1, show_steps=False)
-        print("--- Final Sturm Sequence ---")
+        print("--- Final Sturm Sequence ---", file=out)
         for i, poly in enumerate(sequence):
-            print(f"f{i}(x) = {to_unicode_superscript(poly.as_expr())}")
-
-        sign_functions = [lambdify(x, poly.as_expr(), modules="math") for poly in sequence]
-        sign_table = []
-
-        for func in sign_functions:
-            row = []
-            for val_x in x_vals_to_use:
-                try:
-                    val_eval = func(val_x)
-                    if abs(val_eval) < EPSILON:
-                        sign_symbol = "0"
-                    else:
-                        sign_symbol = "+" if val_eval > 0 else "-"
-                except Exception:
-                    sign_symbol = "ERR"
-                row.append(sign_symbol)
-            sign_table.append(row)
+            print(f"f{i}(x) = {to_unicode_superscript(poly.as_expr())}", file=out)
+
+        sign_table = sign_table_exact([integer_coefficients(poly) for poly in sequence], exact_points)
 
         sign_changes_at_x = [count_sign_changes([sign_table[row][col] for row in range(len(sign_table))]) for col in range(len(x_vals_to_use))]
 
         col_width = max(max(len(str(xv)) for xv in x_vals_to_use), 3) + 2
         header = f"{'f⁰(x)':<7}| " + " ".join(f"{xv:^{col_width}} |" for xv in x_vals_to_use)
-        print(header)
-        print("-" * len(header))
+        print(header, file=out)
+        print("-" * len(header), file=out)
 
         for i, row in enumerate(sign_table):
             line = f"f{i}(x) | " + " ".join(f"{s:^{col_width}} |" for s in row)
-            print(line)
-        print("-" * len(header))
+            print(line, file=out)
+        print("-" * len(header), file=out)
 
         changes_line = f"V(x)  | " + " ".join(f"{c:^{col_width}} |" for c in sign_changes_at_x)
-        print(changes_line)
+        print(changes_line, file=out)
 
         root_intervals = find_root_intervals(x_vals_to_use, sign_changes_at_x)
-        print("\n=== Intervals Containing Roots ===")
+        print("\n=== Intervals Containing Roots ===", file=out)
         if root_intervals:
             for a, b, count in root_intervals:
-                print(f" - {count} real root{'s' if count > 1 else ''} in interval ({a}, {b})")
+                print(f" - {count} real root{'s' if count > 1 else ''} in interval ({a}, {b})", file=out)
         else:
-            print(" - No real roots detected in the evaluated range.")
+            print(" - No real roots detected in the evaluated range.", file=out)
 
     except Exception as e:
-        print(f"Error in Sturm's method: {e}")
-    finally:
-        sys.stdout = old_stdout
-        return mystdout.getvalue()
+        print(f"Error in Sturm's method: {e}", file=out)
+
+    return out.getvalue()
 
 if __name__ == "__main__":
     result_no_arg = main()
@@ -1,6 +1,7 @@
 import math
 import re
-from fractions import Fraction
+from bisect import bisect_left
+from functools import lru_cache
 
 allowed_names = {
     "sin": math.sin, "cos": math.cos, "tan": math.tan,
@@ -32,97 +33,211 @@ def safe_eval(expr):
     except Exception:
         raise ValueError("❌ Invalid mathematical expression")
 
-def float_to_pi_fraction(x, tol=1e-6):
-    if x == 0:
-        return "0"
-    coeff = x / math.pi
-    sign = "-" if coeff < 0 else ""
-    abs_coeff = abs(coeff)
-
-    known = {
-        1/6: "π/6", 1/4: "π/4", 1/3: "π/3", 1/2: "π/2",
-        2/3: "2π/3", 3/4: "3π/4", 5/6: "5π/6", 1: "π",
-        7/6: "7π/6", 5/4: "5π/4", 4/3: "4π/3", 3/2: "3π/2",
-        5/3: "5π/3", 7/4: "7π/4", 11/6: "11π/6", 2: "2π"
+def numpy_names():
+    # allowed_names with NumPy ufuncs; callers silence the divide/invalid
+    # warnings and mask the non-finite entries afterwards.
+    import numpy as np
+    return {
+        "sin": np.sin, "cos": np.cos, "tan": np.tan,
+        "asin": np.arcsin, "acos": np.arccos, "atan": np.arctan,
+        "csc": lambda x: 1 / np.sin(x),
+        "sec": lambda x: 1 / np.cos(x),
+        "cot": lambda x: 1 / np.tan(x),
+        "acsc": lambda x: np.arcsin(1 / np.asarray(x, dtype=float)),
+        "asec": lambda x: np.arccos(1 / np.asarray(x, dtype=float)),
+        "acot": lambda x: np.arctan(1 / np.asarray(x, dtype=float)),
+        "sqrt": np.sqrt,
+        "pi": np.pi, "e": np.e
     }
 
-    for val, label in known.items():
-        if abs(abs_coeff - val) < tol:
-            return sign + label
+def compile_expression(expr: str):
+    try:
+        return compile(fix_expression(expr), "<trig_calc>", "eval")
+    except SyntaxError:
+        raise ValueError("❌ Invalid mathematical expression")
 
-    frac = Fraction(coeff).limit_denominator(12)
-    return f"{sign}{abs(frac.numerator)}π/{frac.denominator}" if frac.denominator != 1 else f"{sign}{abs(frac.numerator)}π"
+def evaluate_array(expr, x_values):
+    """
+    Evaluates an expression in x over a whole array of angles, compiling it
+    once.  Returns (values, valid): entries hit by a division by zero or a
+    domain error are NaN/inf in values and False in valid, while the rest of
+    the batch is unaffected.
+    """
+    import numpy as np
+    code = expr if not isinstance(expr, str) else compile_expression(expr)
+    x = np.asarray(x_values, dtype=float)
+    names = numpy_names()
+    names["x"] = x
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        try:
+            values = eval(code, {"__builtins__": {}}, names)
+        except ZeroDivisionError:
+            values = np.nan
+        except Exception:
+            raise ValueError("❌ Invalid mathematical expression")
+    values = np.broadcast_to(np.asarray(values, dtype=float), x.shape)
+    return values, np.isfinite(values)
+
+def evaluate_range(expr, start, stop, num=1000):
+    import numpy as np
+    x = np.linspace(start, stop, num)
+    values, valid = evaluate_array(expr, x)
+    return x, values, valid
+
+PI_DENOMINATOR_LIMIT = 24
+SURD_RADICANDS = (2, 3, 5, 6, 7, 10, 11, 13, 14, 15)
+SURD_DENOMINATOR_LIMIT = 12
+# The index is dense, so a match must be far closer than a typed decimal
+# could be by accident; evaluation error on an exact value is ~1e-15.
+EXACT_TOLERANCE = 1e-9
+
+def _surd(coeff, radicand):
+    return f"√{radicand}" if coeff == 1 else f"{coeff}√{radicand}"
+
+def _over(numerator, denominator, grouped):
+    if denominator == 1:
+        return numerator
+    return f"({numerator})/{denominator}" if grouped else f"{numerator}/{denominator}"
+
+def _exact_values():
+    # Positive irrational values with their labels, simplest forms first so
+    # that they win when two forms coincide.  Plain rationals are left out:
+    # a rational result prints as a decimal, however it was reached.
+    limit = SURD_DENOMINATOR_LIMIT
+    for c in range(1, limit + 1):
+        for b in SURD_RADICANDS:
+            for s in range(1, 7):
+                if math.gcd(s, c) == 1:
+                    yield s * math.sqrt(b) / c, _over(_surd(s, b), c, False)
+    for c in range(1, limit + 1):
+        for b in SURD_RADICANDS:
+            for a in range(-6, 7):
+                for s in range(-6, 7):
+                    if a == 0 or s == 0 or math.gcd(math.gcd(a, s), c) != 1:
+                        continue
+                    value = (a + s * math.sqrt(b)) / c
+                    if value <= 0:
+                        continue
+                    if a > 0:
+                        label = f"{a}{'+' if s > 0 else '-'}{_surd(abs(s), b)}"
+                    else:
+                        label = f"{_surd(s, b)}-{-a}"
+                    yield value, _over(label, c, True)
+    pairs = [(b1, b2) for b1 in SURD_RADICANDS[:4] for b2 in SURD_RADICANDS[:4] if b1 < b2]
+    for c in range(1, limit + 1):
+        for b1, b2 in pairs:
+            yield (math.sqrt(b1) + math.sqrt(b2)) / c, _over(f"√{b1}+√{b2}", c, True)
+            yield (math.sqrt(b2) - math.sqrt(b1)) / c, _over(f"√{b2}-√{b1}", c, True)
+
+def _pi_multiples():
+    for n in range(1, PI_DENOMINATOR_LIMIT + 1):
+        for k in range(1, 4 * n + 1):
+            if math.gcd(k, n) == 1:
+                yield k / n, _over(f"{'' if k == 1 else k}π", n, False)
+
+@lru_cache(maxsize=None)
+def exact_index(kind="value"):
+    """
+    Sorted (keys, labels) for exact-form recognition, built once per kind:
+    "value" covers s√b/c, (a ± s√b)/c and (√b1 ± √b2)/c; "pi" covers
+    the coefficients k/n of kπ/n.  Keys are positive; callers add the sign.
+    """
+    entries = {}
+    for value, label in (_pi_multiples() if kind == "pi" else _exact_values()):
+        entries.setdefault(round(value, 12), label)
+    keys = sorted(entries)
+    return keys, [entries[key] for key in keys]
+
+def lookup_exact(x, tol=EXACT_TOLERANCE, kind="value"):
+    keys, labels = exact_index(kind)
+    target = abs(x)
+    i = bisect_left(keys, target)
+    best = None
+    for j in (i - 1, i):
+        if 0 <= j < len(keys) and abs(keys[j] - target) < tol:
+            if best is None or abs(keys[j] - target) < abs(keys[best] - target):
+                best = j
+    if best is None:
+        return None
+    return ("-" if x < 0 else "") + labels[best]
+
+def classify_array(values, tol=EXACT_TOLERANCE, kind="value"):
+    """
+    Batch lookup_exact over a NumPy array: returns an object array holding
+    the exact label of every recognised entry ("0" for zeros) and None
+    elsewhere.  For kind="pi", values are coefficients of π.
+    """
+    import numpy as np
+    keys, labels = exact_index(kind)
+    keys = np.asarray(keys)
+    labels = np.asarray(labels, dtype=object)
+    values = np.asarray(values, dtype=float)
+    target = np.abs(values)
+    hi = np.clip(np.searchsorted(keys, target), 0, len(keys) - 1)
+    lo = np.clip(hi - 1, 0, len(keys) - 1)
+    nearest = np.where(np.abs(keys[lo] - target) <= np.abs(keys[hi] - target), lo, hi)
+    with np.errstate(invalid="ignore"):
+        matched = np.abs(keys[nearest] - target) < tol
+    signs = np.where(values < 0, "-", "").astype(object)
+    result = np.where(matched, signs + labels[nearest], None)
+    result[target < tol] = "0"
+    return result
+
+def float_to_pi_fraction(x, tol=EXACT_TOLERANCE):
+    # kπ/n from the exact index, or None when x is not one of them.
+    if x == 0:
+        return "0"
+    return lookup_exact(x / math.pi, tol, kind="pi")
 
-def float_to_sqrt_fraction(x, tol=1e-6):
-    sqrt_vals = {
-        math.sqrt(3): "√3", math.sqrt(2): "√2", math.sqrt(5): "√5",
-        math.sqrt(6): "√6", math.sqrt(7): "√7",
-        1 / math.sqrt(2): "1/√2", 1 / math.sqrt(3): "1/√3"
-    }
-    for val, sym in sqrt_vals.items():
-        if abs(x - val) < tol:
-            return sym
-        if abs(x + val) < tol:
-            return f"-{sym}"
-    return None
+def float_to_sqrt_fraction(x, tol=EXACT_TOLERANCE):
+    label = lookup_exact(x, tol)
+    return label if label and "√" in label else None
 
 def format_decimal_result(result, tol=1e-6):
     if abs(result) < tol:
         return "0"
 
-    known_values = {
-        math.sqrt(3)/2: "√3/2", math.sqrt(2)/2: "√2/2", 1/math.sqrt(3): "√3/3",
-        1/2: "1/2", -math.sqrt(3)/2: "-√3/2", -1/2: "-1/2",
-        0.5: "1/2", -0.5: "-1/2", 1: "1", -1: "-1"
-    }
-    for val, sym in known_values.items():
-        if abs(result - val) < tol:
-            return sym
-
-    sqrt_sym = float_to_sqrt_fraction(result, tol)
-    if sqrt_sym:
-        return sqrt_sym
+    label = lookup_exact(result)
+    if label:
+        return label
 
     return f"{result:.6f}"
 
 def try_inverse_symbolic(expr: str, result: float):
     if any(fn in expr for fn in ("asin", "acos", "atan", "acsc", "asec", "acot")):
-        return f"{float_to_pi_fraction(result)}"
+        return float_to_pi_fraction(result)
     return None
 
 def main(expression_string=None):
     from io import StringIO
-    import sys
 
     if not expression_string:
         expression_string = "sin(4pi) + cos(pi/3)"
 
     expression_string = expression_string.strip()
-    old_stdout = sys.stdout
-    sys.stdout = mystdout = StringIO()
+    out = StringIO()
 
-    print(f"\n📐 Evaluating: {expression_string}")
+    print(f"\n📐 Evaluating: {expression_string}", file=out)
 
     try:
         result = safe_eval(expression_string)
         if isinstance(result, (int, float)):
             symbolic = try_inverse_symbolic(expression_string, result)
             if symbolic:
-                print(f"Result: {symbolic}")
+                print(f"Result: {symbolic}", file=out)
             else:
-                print(f"Result: {format_decimal_result(result)}")
+                print(f"Result: {format_decimal_result(result)}", file=out)
         else:
-            print("❌ Error: Invalid result type")
+            print("❌ Error: Invalid result type", file=out)
 
     except ValueError as ve:
-        print(ve)
+        print(ve, file=out)
     except ZeroDivisionError as zde:
-        print(zde)
+        print(zde, file=out)
     except Exception as e:
-        print(f"❌ Unexpected error: {e}")
+        print(f"❌ Unexpected error: {e}", file=out)
 
-    sys.stdout = old_stdout
-    return mystdout.getvalue()
+    return out.getvalue()
 
 if __name__ == "__main__":
     while True:
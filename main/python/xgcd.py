@@ -0,0 +1,94 @@
+"""
+Extended Euclid shared by congruence and CRT.
+
+xgcd(a, b) returns (g, p, q) with a*p + b*q = g, the same triple the old
+recursive gcd(a, m) helpers produced, but iteratively.  When both operands
+are large, Lehmer's method runs most of the quotient sequence on the
+leading 62 bits and applies the accumulated 2x2 cofactor matrix to the
+full-size numbers once per batch.
+
+parse_int and int_text convert between decimal text and ints of any size
+without touching the interpreter-wide int/str digit limit.
+"""
+import math
+import sys
+
+WORD_BITS = 62
+LEHMER_BITS = 2 * WORD_BITS
+PARSE_CHUNK = 4000  # below the default int/str digit limit of 4300
+EDGE_DIGITS = 20
+
+
+def _lehmer_matrix(ah, bh):
+    # Knuth's Algorithm L inner loop: follow Euclid on the leading bits while
+    # both bounds agree on the quotient.
+    A, B, C, D = 1, 0, 0, 1
+    while bh + C != 0 and bh + D != 0:
+        q = (ah + A) // (bh + C)
+        if q != (ah + B) // (bh + D):
+            break
+        A, C = C, A - q * C
+        B, D = D, B - q * D
+        ah, bh = bh, ah - q * bh
+    return A, B, C, D
+
+
+def xgcd(a, b):
+    u0, v0, u1, v1 = 1, 0, 0, 1
+
+    if a > 0 and b > 0:
+        while b.bit_length() > LEHMER_BITS:
+            shift = max(a.bit_length(), b.bit_length()) - WORD_BITS
+            A, B, C, D = _lehmer_matrix(a >> shift, b >> shift)
+            if B == 0:
+                q, r = divmod(a, b)
+                a, b = b, r
+                u0, u1 = u1, u0 - q * u1
+                v0, v1 = v1, v0 - q * v1
+            else:
+                a, b = A * a + B * b, C * a + D * b
+                u0, u1 = A * u0 + B * u1, C * u0 + D * u1
+                v0, v1 = A * v0 + B * v1, C * v0 + D * v1
+
+    while b:
+        q, r = divmod(a, b)
+        a, b = b, r
+        u0, u1 = u1, u0 - q * u1
+        v0, v1 = v1, v0 - q * v1
+    return a, u0, v0
+
+
+def _parse_digits(digits):
+    if len(digits) <= PARSE_CHUNK:
+        return int(digits)
+    half = len(digits) // 2
+    return _parse_digits(digits[:half]) * 10 ** (len(digits) - half) + _parse_digits(digits[half:])
+
+
+def parse_int(text):
+    """int(text) for a decimal literal of any length."""
+    text = text.strip()
+    if len(text) <= PARSE_CHUNK:
+        return int(text)
+    sign, digits = (-1, text[1:]) if text[0] == "-" else (1, text[1:] if text[0] == "+" else text)
+    if not (digits.isascii() and digits.isdigit()):
+        raise ValueError(f"invalid literal for int(): '{text[:EDGE_DIGITS]}...'")
+    return sign * _parse_digits(digits)
+
+
+def int_text(n):
+    """
+    str(n), or its leading and trailing digits with the digit count when n
+    is past the interpreter's int/str digit limit.
+    """
+    try:
+        return str(n)
+    except ValueError:
+        pass
+    sign, n = ("-", -n) if n < 0 else ("", n)
+    digits = int(n.bit_length() * math.log10(2)) + 1
+    if n < 10 ** (digits - 1):
+        digits -= 1
+    head = n // 10 ** (digits - EDGE_DIGITS)
+    tail = n % 10 ** EDGE_DIGITS
+    return f"{sign}{head}...{tail:0{EDGE_DIGITS}d} ({digits} digits)"